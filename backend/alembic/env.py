@@ -28,6 +28,12 @@ from app.models import (
     form,
     form_field,
     submission,
+    export_job,
+    tenant_stats,
+    rollup,
+    refresh_token,
+    revoked_token,
+    api_key,
 )
 
 # this is the Alembic Config object, which provides
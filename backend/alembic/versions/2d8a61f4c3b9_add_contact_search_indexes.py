@@ -0,0 +1,49 @@
+"""add_contact_search_indexes
+
+Revision ID: 2d8a61f4c3b9
+Revises: 7b3f0e9c1d25
+Create Date: 2026-10-18 13:41:52.604417+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || "
+    "regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') || ' ' || coalesce(source, ''))"
+)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(email, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(phone, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(source, '')), 'C')"
+)
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8a61f4c3b9'
+down_revision: Union[str, Sequence[str], None] = '7b3f0e9c1d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Lets the GIN indexes lead with tenant_id (uuid)
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.add_column('contact', sa.Column('search_text', sa.Text(), sa.Computed(SEARCH_TEXT_SQL, persisted=True), nullable=True))
+    op.add_column('contact', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True))
+    op.create_index('ix_contact_search_trgm', 'contact', ['tenant_id', 'search_text'], unique=False, postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
+    op.create_index('ix_contact_search_vector', 'contact', ['tenant_id', 'search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_search_vector', table_name='contact', postgresql_using='gin')
+    op.drop_index('ix_contact_search_trgm', table_name='contact', postgresql_using='gin')
+    op.drop_column('contact', 'search_vector')
+    op.drop_column('contact', 'search_text')
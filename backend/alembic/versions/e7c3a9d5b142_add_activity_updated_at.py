@@ -0,0 +1,36 @@
+"""add_activity_updated_at
+
+Revision ID: e7c3a9d5b142
+Revises: d4a9c2e7f813
+Create Date: 2026-10-18 21:14:05.552817+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3a9d5b142'
+down_revision: Union[str, Sequence[str], None] = 'd4a9c2e7f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('activity', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Existing activities were last changed no earlier than they were created
+    op.execute("UPDATE activity SET updated_at = created_at")
+    # Export fingerprints read max(updated_at) per tenant
+    op.create_index('ix_activity_tenant_updated', 'activity', ['tenant_id', 'updated_at'], unique=False)
+    # Files exported before this may predate edits their fingerprint could not
+    # see; a fingerprint no dataset produces keeps them from being reused
+    op.execute("UPDATE exportjob SET fingerprint = repeat('0', 64) WHERE dataset = 'activities'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_tenant_updated', table_name='activity')
+    op.drop_column('activity', 'updated_at')
@@ -1,38 +1,62 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+import uuid
+from typing import Callable, Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 import jwt
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from app.core import security
 from app.core.config import settings
+from app.core.limiter import Rate, get_client_ip, limiter, parse_rate
+from app.core.metrics import metrics
+from app.schemas.api_key import ApiKeyPrincipal
+from app.schemas.auth import UserPrincipal
 from app.schemas.token import TokenPayload
 from app.db.session import get_db
-from app.models.user import User, UserRole  # Added Import
+from app.models.user import UserRole
+from app.services.api_key_directory import ApiKeyDirectory
+from app.services.revocation import revocation_list
+from app.services.user_directory import UserDirectory
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
+# Server-to-server clients; optional so public routes still work without one
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
 async def get_current_user_context(
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(reusable_oauth2)
 ) -> TokenPayload:
     """
     Decodes the JWT and returns the payload (User ID + Tenant ID).
-    Does NOT query the DB yet (stateless validation for speed).
+    Does NOT query the DB yet (stateless validation for speed): the
+    revocation check is answered in memory unless the bloom filter hits.
     """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
+    except jwt.ExpiredSignatureError:
+        # 401 tells clients to renew with POST /auth/refresh
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     except (jwt.InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+    if token_data.jti and await revocation_list.is_revoked(db, token_data.jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
     return token_data
 
 async def get_current_tenant_id(
@@ -52,29 +76,26 @@ async def get_current_tenant_id(
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token_data: TokenPayload = Depends(get_current_user_context)
-) -> User:
+) -> UserPrincipal:
     """
-    Fetches the current user from the Database.
+    Resolves the current user (cached; see UserDirectory).
     CRITICAL: Validates that the user belongs to the tenant claims in the token.
     """
-    from app.models.user import User  # Late import to avoid cycles
-    
     # 1. We start with the user ID from the token
     user_id = token_data.sub
     tenant_id = token_data.tenant_id
     
     if not user_id or not tenant_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
+    try:
+        uuid.UUID(user_id), uuid.UUID(tenant_id)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
 
     # 2. Strict Tenant Scoping:
-    # We MUST filter by BOTH id AND tenant_id.
-    # If a user ID exists but in a different tenant, this query returns None.
-    stmt = select(User).where(
-        User.id == user_id,
-        User.tenant_id == tenant_id
-    )
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    # Resolved by BOTH id AND tenant_id.
+    # If a user ID exists but in a different tenant, this returns None.
+    user = await UserDirectory.resolve(db, user_id, tenant_id)
     
     if not user:
         raise HTTPException(
@@ -88,8 +109,8 @@ async def get_current_user(
     return user
 
 async def get_current_active_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> UserPrincipal:
     """
     Verifies that the current user is an admin.
     """
@@ -104,7 +125,7 @@ def require_role(required_roles: list[UserRole]):
     """
     Factory for a dependency that checks if the user has one of the required roles.
     """
-    async def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: UserPrincipal = Depends(get_current_user)):
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=403,
@@ -112,3 +133,63 @@ def require_role(required_roles: list[UserRole]):
             )
         return current_user
     return role_checker
+
+def tenant_user_rate_limit(scope: str, spec: str):
+    """
+    Factory for a rate-limit dependency on authenticated routes.
+    One token bucket per (tenant, user), read from the already-validated token.
+    """
+    rate = Rate(spec)
+
+    async def limit_checker(token_data: TokenPayload = Depends(get_current_user_context)):
+        await limiter.hit(scope, f"{token_data.tenant_id}:{token_data.sub}", rate)
+    return limit_checker
+
+async def get_api_key(
+    db: AsyncSession = Depends(get_db),
+    key: Optional[str] = Depends(api_key_header)
+) -> Optional[ApiKeyPrincipal]:
+    """
+    Resolves the X-API-Key header (cached; see ApiKeyDirectory).
+    None when the header is absent; 401 when it does not name a usable key.
+    """
+    if key is None:
+        return None
+    api_key = await ApiKeyDirectory.resolve(db, key)
+    if not api_key:
+        metrics.incr("api_key.rejected")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key",
+        )
+    return api_key
+
+def api_key_or_rate_limit(
+    required_scope: str,
+    scope: str,
+    spec: str,
+    key_func: Callable[[Request], str] = get_client_ip
+):
+    """
+    Factory for public routes that also accept API keys.
+    With a key: it must carry `required_scope`, and its own token bucket applies.
+    Without one: `spec` per `key_func` bucket (client IP by default), as for
+    any anonymous caller. Returns the key (or None).
+    """
+    rate = Rate(spec)
+
+    async def limit_checker(
+        request: Request,
+        api_key: Optional[ApiKeyPrincipal] = Depends(get_api_key)
+    ) -> Optional[ApiKeyPrincipal]:
+        if api_key is None:
+            await limiter.hit(scope, key_func(request), rate)
+            return None
+        if required_scope not in api_key.scopes:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"API key lacks the {required_scope} scope"
+            )
+        await limiter.hit("api_key", str(api_key.id), parse_rate(api_key.rate_limit or settings.RATE_LIMIT_API_KEY))
+        return api_key
+    return limit_checker
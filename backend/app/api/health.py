@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.api import deps
+from app.core.config import settings
+from app.core.metrics import metrics
 
 router = APIRouter()
 
@@ -29,9 +33,25 @@ async def health_check(
             detail="Database unreachable"
         )
         
-    # 2. Check Cache (Optional - if using Redis)
-    # import fastapi_cache
-    # if fastapi_cache.FastAPICache.get_backend():
-    #     ...
-    
     return health_status
+
+def require_metrics_token(authorization: Optional[str] = Header(None)):
+    """
+    Internal counters are not public: the caller must present METRICS_TOKEN.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode("utf-8"), settings.METRICS_TOKEN.encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+async def read_metrics():
+    """
+    In-process counters and gauges for this worker (rate limiting, etc.).
+    """
+    return metrics.snapshot()
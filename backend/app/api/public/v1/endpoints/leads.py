@@ -1,50 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from app.api import deps
-from app.core.limiter import limiter
+from app.core.config import settings
+from app.core.limiter import get_client_ip
+from app.core.idempotency import idempotency
+from app.models.api_key import ApiKeyScope
+from app.schemas.api_key import ApiKeyPrincipal
 from app.schemas.public import PublicLeadCreate
 from app.schemas.crm import ContactCreate
-from app.models.tenant import Tenant
 from app.services.contact_service import ContactService
+from app.services.tenant_directory import TenantDirectory
 
 router = APIRouter()
 
 @router.post("/leads")
-@limiter.limit("5/minute")
 async def create_public_lead(
     request: Request,
     data: PublicLeadCreate,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(deps.get_db)
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    api_key: Optional[ApiKeyPrincipal] = Depends(deps.api_key_or_rate_limit(
+        ApiKeyScope.LEADS_WRITE.value, "public_leads", settings.RATE_LIMIT_PUBLIC_LEADS
+    )),
+    idempotency_key: Optional[str] = Header(None)
 ):
-    # 1. Resolve Tenant by Slug (No JWT)
-    stmt = select(Tenant).where(Tenant.slug == data.tenant_slug)
-    result = await db.execute(stmt)
-    tenant = result.scalar_one_or_none()
-    
-    if not tenant:
-        # Security: Return 404 to avoid enumeration? 
-        # Or 400? 404 feels safer or just "Success" to pretend.
-        # For now, explicit error for developer debug.
-        raise HTTPException(status_code=404, detail="Tenant not found")
+    """
+    Creates a contact. Integrations authenticate with an X-API-Key header
+    (tenant taken from the key, per-key rate limit); anonymous callers name
+    the tenant by slug and share a small per-IP limit.
+    """
+    # 1. Resolve Tenant: from the API key, or by Slug (No JWT, cached)
+    if api_key:
+        tenant_id = str(api_key.tenant_id)
+    else:
+        if not data.tenant_slug:
+            raise HTTPException(status_code=400, detail="tenant_slug is required without an API key")
+        tenant = await TenantDirectory.resolve(db, data.tenant_slug)
+
+        if not tenant or not tenant.is_active:
+            # Security: Return 404 to avoid enumeration? 
+            # Or 400? 404 feels safer or just "Success" to pretend.
+            # For now, explicit error for developer debug.
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        tenant_id = str(tenant.id)
         
-    # 2. Convert to ContactCreate
-    contact_data = ContactCreate(
-        name=data.name,
-        email=data.email,
-        phone=data.phone,
-        source=data.source,
-        status="new"
-    )
-    
-    # 3. Create Contact (Triggers Audit Log via BackgroundTasks)
-    # user_id is None because it's public
-    contact = await ContactService.create(
-        db, 
-        tenant_id=str(tenant.id), 
-        data=contact_data, 
-        background_tasks=background_tasks
+    async def process() -> dict:
+        # 2. Convert to ContactCreate
+        contact_data = ContactCreate(
+            name=data.name,
+            email=data.email,
+            phone=data.phone,
+            source=data.source,
+            status="new"
+        )
+        
+        # 3. Create Contact (Triggers Audit Log via BackgroundTasks)
+        # user_id is None because it's public
+        contact = await ContactService.create(
+            db, 
+            tenant_id=tenant_id, 
+            data=contact_data, 
+            background_tasks=background_tasks
+        )
+        
+        return {"status": "success", "id": str(contact.id)}
+
+    # Retries / double submits replay the first response instead of creating again
+    caller = f"key:{api_key.id}" if api_key else get_client_ip(request)
+    request_key = idempotency.key_for(
+        "public_leads", tenant_id, idempotency_key, data.model_dump(mode="json"), caller
     )
-    
-    return {"status": "success", "id": str(contact.id)}
+    result, replayed = await idempotency.run(request_key, process)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
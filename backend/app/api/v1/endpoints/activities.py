@@ -1,11 +1,14 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.core.pagination import set_page_headers
 from app.schemas.crm import ActivityCreate, ActivityRead, ActivityUpdate
 from app.models.activity import ActivityType
-from app.models.user import User
-from app.services.activity_service import ActivityService
+from app.schemas.auth import UserPrincipal
+from app.services.activity_service import ACTIVITY_FILTERS, ActivityService
+from app.services.export_service import ExportService
+from app.schemas.export import ExportFormat
 
 router = APIRouter()
 
@@ -14,20 +17,58 @@ async def create_activity(
     data: ActivityCreate,
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: UserPrincipal = Depends(deps.get_current_user)
 ):
     return await ActivityService.create(db, tenant_id, str(current_user.id), data)
 
+@router.get("/", response_model=List[ActivityRead])
+async def read_all_activities(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    All activities of the tenant, newest first (cursor-paginated).
+
+    Filters: type, contact_id (`=`, `!=`, comma list for IN),
+    created_at (also `>`, `>=`, `<`, `<=`). Sort: `sort=created_at` / `-created_at`.
+    """
+    query = ACTIVITY_FILTERS.parse(request.url.query)
+    page = await ActivityService.get_all(db, tenant_id, query, cursor, limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+# Declared before "/{contact_id}" so "export" is not taken for a contact id
+@router.get("/export")
+async def export_activities(
+    format: ExportFormat = ExportFormat.CSV,
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Streams every activity of the tenant as CSV, gzip NDJSON, Arrow IPC or Parquet.
+    """
+    return ExportService.streaming_response(ExportService.activities(tenant_id), format)
+
 @router.get("/{contact_id}", response_model=List[ActivityRead])
 async def read_activities(
     contact_id: str,
-    skip: int = 0,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 50,
     type: Optional[ActivityType] = None,
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id)
 ):
-    return await ActivityService.get_by_contact(db, tenant_id, contact_id, skip=skip, limit=limit, type_=type)
+    """
+    Newest first. Follow X-Next-Cursor / X-Prev-Cursor (or the Link header) for more pages.
+    """
+    page = await ActivityService.get_by_contact(db, tenant_id, contact_id, cursor=cursor, limit=limit, type_=type)
+    set_page_headers(request, response, page)
+    return page.items
 
 @router.put("/{activity_id}", response_model=ActivityRead)
 async def update_activity(
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.api import deps
+from app.core import security
+from app.models.api_key import ApiKey
+from app.schemas.api_key import ApiKeyCreate, ApiKeyCreated, ApiKeyRead
+from app.schemas.auth import UserPrincipal
+from app.services.api_key_directory import ApiKeyDirectory
+import uuid
+
+router = APIRouter()
+
+@router.get("/", response_model=List[ApiKeyRead])
+async def read_api_keys(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_active_admin),
+) -> Any:
+    """
+    API keys of the tenant, revoked ones included (admin only).
+    """
+    stmt = select(ApiKey).where(ApiKey.tenant_id == current_user.tenant_id).order_by(ApiKey.created_at)
+    return (await db.execute(stmt)).scalars().all()
+
+@router.post("/", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED)
+async def create_api_key(
+    data: ApiKeyCreate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_active_admin),
+) -> Any:
+    """
+    Create an API key (admin only). The key is only returned by this call.
+    """
+    key = security.create_api_key()
+    api_key = ApiKey(
+        name=data.name,
+        prefix=key[:12],
+        key_hash=security.hash_api_key(key),
+        scopes=[scope.value for scope in data.scopes],
+        rate_limit=data.rate_limit,
+        created_by_id=current_user.id,
+        tenant_id=current_user.tenant_id
+    )
+    db.add(api_key)
+    await db.commit()
+    await db.refresh(api_key)
+    return ApiKeyCreated(**ApiKeyRead.model_validate(api_key).model_dump(), key=key)
+
+@router.delete("/{api_key_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_key(
+    api_key_id: uuid.UUID,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_active_admin),
+):
+    """
+    Revoke an API key (admin only). Takes effect on every worker immediately.
+    """
+    stmt = select(ApiKey).where(ApiKey.id == api_key_id, ApiKey.tenant_id == current_user.tenant_id)
+    api_key = (await db.execute(stmt)).scalar_one_or_none()
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+
+    if api_key.revoked_at is None:
+        api_key.revoked_at = datetime.utcnow()
+        await db.commit()
+        await ApiKeyDirectory.invalidate(api_key.key_hash)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
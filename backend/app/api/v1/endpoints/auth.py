@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from app.api import deps
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.session import get_db
 from app.schemas.auth import AuthRegister, AuthLogin, UserRead
-from app.schemas.token import Token
+from app.schemas.token import LogoutRequest, RefreshRequest, Token, TokenPayload
 from app.models.tenant import Tenant
 from app.models.website import Website
 from app.models.user import User, UserRole
-from app.core import security
+from app.core.hashing import password_hasher
+from app.core.metrics import metrics
+from app.core.password_policy import password_policy
+from app.core.limiter import ip_rate_limit
+from app.services.tenant_directory import TenantDirectory
+from app.services.revocation import revocation_list
+from app.services.token_service import TokenService
 import uuid
 from app.core.config import settings
 
@@ -20,14 +29,15 @@ async def register(
 ):
     print("🔥 REGISTER ENDPOINT HIT")
     # 1. Check if Tenant slug exists
-    stmt = select(Tenant).where(Tenant.slug == data.company_slug)
-    result = await db.execute(stmt)
-    if result.scalar_one_or_none():
+    if await TenantDirectory.resolve(db, data.company_slug):
         raise HTTPException(
             status_code=400,
             detail="Tenant slug already exists."
         )
 
+    # Hash before opening the transaction (may queue, or 503 under load)
+    hashed_password = await password_hasher.hash(data.admin_password)
+
     # 2. Atomic Transaction: Create Tenant + Admin User
     try:
         # Create Tenant
@@ -39,7 +49,6 @@ async def register(
         await db.flush()  # Generates ID for new_tenant (via Python default or DB returning)
 
         # Create Admin User
-        hashed_password = security.get_password_hash(data.admin_password)
         new_user = User(
             email=data.admin_email,
             password_hash=hashed_password,
@@ -61,6 +70,9 @@ async def register(
         
         await db.commit()
         await db.refresh(new_user)
+        # Drop negative entries for the slug (the existence check above, and
+        # lookups on other workers) so the new tenant can log in right away
+        await TenantDirectory.invalidate(data.company_slug)
         return new_user
         
     except ValueError as e:
@@ -92,10 +104,8 @@ async def login(
     data: AuthLogin,
     db: AsyncSession = Depends(get_db)
 ):
-    # 1. Resolve Tenant
-    stmt = select(Tenant).where(Tenant.slug == data.tenant_slug)
-    result = await db.execute(stmt)
-    tenant = result.scalar_one_or_none()
+    # 1. Resolve Tenant (cached)
+    tenant = await TenantDirectory.resolve(db, data.tenant_slug)
     
     if not tenant:
         raise HTTPException(status_code=400, detail="Tenant not found")
@@ -112,16 +122,58 @@ async def login(
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
 
-    if not user or not security.verify_password(data.password, user.password_hash):
+    if not user or not await password_hasher.verify(data.password, user.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
         
     if not user.is_active:
         raise HTTPException(status_code=400, detail="User is inactive")
 
-    # 3. Issue Token with Tenant Context
-    access_token = security.create_access_token(
-        subject=user.id,
-        tenant_id=str(tenant.id)
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Upgrade hashes made under an older cost policy while the password is at hand
+    if password_policy.needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await password_hasher.hash(data.password)
+            metrics.incr("password_hash.rehashed")
+        except HTTPException:
+            pass  # Hasher overloaded: keep the old hash, retry on a later login
+
+    # 3. Issue Tokens with Tenant Context (access + refresh, new token family; commits the rehash)
+    return await TokenService.issue(db, user.id, tenant.id)
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+    dependencies=[Depends(ip_rate_limit("auth_refresh", settings.RATE_LIMIT_AUTH_REFRESH))]
+)
+async def refresh(
+    data: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchanges a refresh token for a new access + refresh token pair.
+    The presented token is consumed; reusing it revokes the whole session.
+    """
+    return await TokenService.refresh(db, data.refresh_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    data: Optional[LogoutRequest] = None,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenPayload = Depends(deps.get_current_user_context)
+):
+    """
+    Revokes the presented access token on every worker (until it would have
+    expired). Pass the refresh token too to end the session for good.
+    """
+    try:
+        user_id, tenant_id = uuid.UUID(token_data.sub), uuid.UUID(token_data.tenant_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+
+    if token_data.jti and token_data.exp:
+        await revocation_list.revoke(
+            db, token_data.jti, datetime.utcfromtimestamp(token_data.exp),
+            user_id=user_id, tenant_id=tenant_id
+        )
+    if data and data.refresh_token:
+        await TokenService.revoke(db, data.refresh_token, user_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
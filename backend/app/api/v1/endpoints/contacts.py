@@ -1,11 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, BackgroundTasks
+from typing import List, Optional
+from fastapi import APIRouter, Depends, BackgroundTasks, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.user import User
+from app.schemas.auth import UserPrincipal
 from app.api import deps
+from app.core.pagination import set_page_headers
 from app.schemas.crm import ContactCreate, ContactRead, ContactUpdate, ContactSummary
-from app.services.contact_service import ContactService
-from app.models.user import User
+from app.services.contact_service import CONTACT_FILTERS, ContactService
+from app.services.export_service import ExportService
+from app.schemas.export import ExportFormat
 
 router = APIRouter()
 
@@ -15,18 +17,58 @@ async def create_contact(
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: UserPrincipal = Depends(deps.get_current_user)
 ):
     return await ContactService.create(db, tenant_id, data, background_tasks, str(current_user.id))
 
 @router.get("/", response_model=List[ContactRead])
 async def read_contacts(
-    skip: int = 0,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 100,
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id)
 ):
-    return await ContactService.get_all(db, tenant_id, skip, limit)
+    """
+    Newest first. Follow X-Next-Cursor / X-Prev-Cursor (or the Link header) for more pages.
+
+    Filters: status, email, website_id (`=`, `!=`, comma list for IN),
+    created_at / updated_at (also `>`, `>=`, `<`, `<=`).
+    Sort: `sort=created_at|updated_at|name`, prefix `-` for descending.
+    """
+    query = CONTACT_FILTERS.parse(request.url.query)
+    page = await ContactService.get_all(db, tenant_id, query, cursor, limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+@router.get("/search", response_model=List[ContactRead])
+async def search_contacts(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = 25,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Best matches first (name, email, phone, source; prefix and typo tolerant).
+    Follow X-Next-Cursor (or the Link header) for more results.
+    """
+    page = await ContactService.search(db, tenant_id, q, cursor, limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+@router.get("/export")
+async def export_contacts(
+    format: ExportFormat = ExportFormat.CSV,
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Streams every contact of the tenant as CSV, gzip NDJSON, Arrow IPC or Parquet.
+    """
+    return ExportService.streaming_response(ExportService.contacts(tenant_id), format)
 
 @router.get("/{contact_id}/summary", response_model=ContactSummary)
 async def get_contact_summary(
@@ -1,13 +1,15 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi_cache.decorator import cache
 from app.api import deps
+from app.schemas.dashboard import TrendInterval, TrendPoint
 from app.services.dashboard_service import DashboardService
 
 router = APIRouter()
 
 @router.get("/overview")
-@cache(expire=60)
 async def get_overview(
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id)
@@ -22,7 +24,6 @@ async def get_overview(
     return await DashboardService.get_overview_stats(db, tenant_id)
 
 @router.get("/pipeline")
-@cache(expire=60)
 async def get_pipeline_breakdown(
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id)
@@ -32,3 +33,58 @@ async def get_pipeline_breakdown(
     { "lead": 10, "proposal": 5, "won": 2, "lost": 8 }
     """
     return await DashboardService.get_pipeline_breakdown(db, tenant_id)
+
+@router.get("/trends/contacts", response_model=List[TrendPoint])
+async def get_contact_trend(
+    interval: TrendInterval = TrendInterval.DAY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    New contacts per bucket (UTC), zero-filled. Defaults to the last 30 days by day.
+    """
+    return await DashboardService.get_contact_trend(db, tenant_id, interval, start, end)
+
+@router.get("/trends/submissions", response_model=Dict[str, List[TrendPoint]])
+async def get_submission_trend(
+    interval: TrendInterval = TrendInterval.DAY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    form_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Form submissions per bucket, keyed by form id:
+    { "<form_id>": [{ "bucket": ..., "count": 12, "value": 0 }, ...] }
+    """
+    return await DashboardService.get_submission_trend(db, tenant_id, interval, start, end, form_id)
+
+@router.get("/trends/deals", response_model=Dict[str, List[TrendPoint]])
+async def get_deal_trend(
+    interval: TrendInterval = TrendInterval.WEEK,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Deals won and lost per bucket (by close date), with their summed value:
+    { "won": [...], "lost": [...] }. Defaults to the last 26 weeks by week.
+    """
+    return await DashboardService.get_deal_trend(db, tenant_id, interval, start, end)
+
+@router.get("/trends/pipeline", response_model=List[TrendPoint])
+async def get_pipeline_trend(
+    interval: TrendInterval = TrendInterval.DAY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Open pipeline at the end of each bucket: `count` open deals, `value` their summed value.
+    """
+    return await DashboardService.get_pipeline_trend(db, tenant_id, interval, start, end)
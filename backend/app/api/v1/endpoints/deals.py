@@ -1,9 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.core.pagination import MAX_PAGE_SIZE, set_page_headers
 from app.schemas.crm import DealCreate, DealRead, DealStageUpdate, DealUpdate
-from app.services.deal_service import DealService
+from app.services.deal_service import DEAL_FILTERS, DealService
+from app.services.export_service import ExportService
+from app.schemas.export import ExportFormat
 
 router = APIRouter()
 
@@ -17,10 +20,34 @@ async def create_deal(
 
 @router.get("/", response_model=List[DealRead])
 async def read_deals(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
     db: AsyncSession = Depends(deps.get_db),
     tenant_id: str = Depends(deps.get_current_tenant_id)
 ):
-    return await DealService.get_all(db, tenant_id)
+    """
+    Newest first. Follow X-Next-Cursor / X-Prev-Cursor (or the Link header) for more pages.
+
+    Filters: stage, contact_id (`=`, `!=`, comma list for IN),
+    value / created_at / updated_at (also `>`, `>=`, `<`, `<=`).
+    Sort: `sort=created_at|updated_at`, prefix `-` for descending.
+    """
+    query = DEAL_FILTERS.parse(request.url.query)
+    page = await DealService.get_all(db, tenant_id, query, cursor, limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+@router.get("/export")
+async def export_deals(
+    format: ExportFormat = ExportFormat.CSV,
+    tenant_id: str = Depends(deps.get_current_tenant_id)
+):
+    """
+    Streams every deal of the tenant as CSV, gzip NDJSON, Arrow IPC or Parquet.
+    """
+    return ExportService.streaming_response(ExportService.deals(tenant_id), format)
 
 @router.put("/{deal_id}/stage", response_model=DealRead)
 async def update_deal_stage(
@@ -0,0 +1,85 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.api import deps
+from app.models.export_job import ExportJob, ExportJobStatus
+from app.schemas.auth import UserPrincipal
+from app.schemas.export import ExportFormat, ExportJobCreate, ExportJobRead
+from app.services.export_jobs import build_dataset, export_jobs
+from app.services.export_service import ExportService
+import os
+import uuid
+
+router = APIRouter()
+
+async def _load_job(db: AsyncSession, job_id: uuid.UUID, tenant_id) -> ExportJob:
+    stmt = select(ExportJob).where(ExportJob.id == job_id, ExportJob.tenant_id == tenant_id)
+    job = (await db.execute(stmt)).scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+@router.post("/", response_model=ExportJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    job_in: ExportJobCreate,
+    current_user: UserPrincipal = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Start a background export. Returns an existing job when one for the
+    same, unchanged data is queued, running or finished.
+    Poll GET /exports/{job_id}, then fetch GET /exports/{job_id}/download.
+    """
+    ExportService.check_format(job_in.format)
+    dataset = await build_dataset(db, job_in.dataset, current_user.tenant_id, job_in.form_id)
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="Form not found")
+    return await export_jobs.create(db, current_user, job_in, dataset)
+
+@router.get("/", response_model=List[ExportJobRead])
+async def read_export_jobs(
+    limit: int = 50,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Recent export jobs of the tenant, newest first.
+    """
+    stmt = select(ExportJob).where(
+        ExportJob.tenant_id == current_user.tenant_id
+    ).order_by(ExportJob.created_at.desc()).limit(min(limit, 200))
+    return (await db.execute(stmt)).scalars().all()
+
+@router.get("/{job_id}", response_model=ExportJobRead)
+async def read_export_job(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
+) -> Any:
+    return await _load_job(db, job_id, current_user.tenant_id)
+
+@router.get("/{job_id}/download")
+async def download_export(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Serves the finished file. Supports Range / If-Range, so clients can
+    resume an interrupted download from the last received byte.
+    """
+    job = await _load_job(db, job_id, current_user.tenant_id)
+    if job.status != ExportJobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status.value}")
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=410, detail="Export file has expired")
+
+    fmt = ExportFormat(job.format)
+    return FileResponse(
+        job.file_path,
+        media_type=ExportService.media_type(fmt),
+        filename=f"{job.dataset}_export.{ExportService.extension(fmt)}"
+    )
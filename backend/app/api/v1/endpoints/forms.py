@@ -1,59 +1,72 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 from app.api import deps
+from app.core.pagination import paginate, set_page_headers
 from app.models.form import Form
 from app.models.form_field import FormField
 from app.models.website import Website
 from app.schemas.form import FormCreate, FormResponse
-from app.models.user import User
+from app.schemas.auth import UserPrincipal
 from app.models.submission import FormSubmission
-from sqlalchemy import select, func, desc
-from fastapi.responses import StreamingResponse
-import io
-import csv
+from app.services.form_registry import FormRegistry
+from app.services.export_service import ExportService
+from sqlalchemy import select, func
+from app.schemas.export import ExportFormat
 import uuid
 
 router = APIRouter()
 
+async def _load_form(db: AsyncSession, form_id: uuid.UUID, tenant_id: uuid.UUID) -> Optional[Form]:
+    # Fields are loaded eagerly: lazy loading is not available on AsyncSession
+    stmt = select(Form).options(selectinload(Form.fields)).where(
+        Form.id == form_id,
+        Form.tenant_id == tenant_id
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
+
 @router.get("/websites/{website_id}/forms", response_model=List[FormResponse])
-def read_forms(
+async def read_forms(
     website_id: uuid.UUID,
-    skip: int = 0,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 100,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve forms for a website.
+    Retrieve forms for a website, oldest first (cursor-paginated).
     """
     # Verify Website ownership
     stmt = select(Website).where(
         Website.id == website_id,
         Website.tenant_id == current_user.tenant_id
     )
-    website = db.execute(stmt).scalar_one_or_none()
+    website = (await db.execute(stmt)).scalar_one_or_none()
     if not website:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Website not found"
         )
 
-    stmt = select(Form).where(
+    stmt = select(Form).options(selectinload(Form.fields)).where(
         Form.website_id == website_id,
         Form.tenant_id == current_user.tenant_id
-    ).offset(skip).limit(limit)
-    forms = db.execute(stmt).scalars().all()
-    return forms
+    )
+    page = await paginate(db, stmt, Form.created_at, Form.id, cursor, limit, descending=False)
+    set_page_headers(request, response, page)
+    return page.items
 
 @router.post("/websites/{website_id}/forms", response_model=FormResponse)
-def create_form(
+async def create_form(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     website_id: uuid.UUID,
     form_in: FormCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
     Create a new form with fields for a specific website.
@@ -63,7 +76,7 @@ def create_form(
         Website.id == website_id,
         Website.tenant_id == current_user.tenant_id
     )
-    website = db.execute(stmt).scalar_one_or_none()
+    website = (await db.execute(stmt)).scalar_one_or_none()
     if not website:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,7 +91,7 @@ def create_form(
         tenant_id=current_user.tenant_id
     )
     db.add(form)
-    db.flush() # Get form.id
+    await db.flush() # Get form.id
     
     # 3. Create Fields
     for field_in in form_in.fields:
@@ -95,25 +108,20 @@ def create_form(
         )
         db.add(field)
     
-    db.commit()
-    db.refresh(form)
-    return form
+    await db.commit()
+    return await _load_form(db, form.id, current_user.tenant_id)
 
 @router.get("/forms/{form_id}", response_model=FormResponse)
-def get_form(
+async def get_form(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     form_id: uuid.UUID,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
     Get form details.
     """
-    stmt = select(Form).where(
-        Form.id == form_id,
-        Form.tenant_id == current_user.tenant_id
-    )
-    form = db.execute(stmt).scalar_one_or_none()
+    form = await _load_form(db, form_id, current_user.tenant_id)
     
     if not form:
         raise HTTPException(
@@ -123,24 +131,66 @@ def get_form(
         
     return form
 
+@router.put("/forms/{form_id}", response_model=FormResponse)
+async def update_form(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    form_id: uuid.UUID,
+    form_in: FormCreate,
+    current_user: UserPrincipal = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Replace a form's name, settings and fields.
+    """
+    form = await _load_form(db, form_id, current_user.tenant_id)
+    if not form:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Form not found"
+        )
+
+    form.name = form_in.name
+    form.settings = form_in.settings
+    # delete-orphan cascade removes the previous fields
+    form.fields = [
+        FormField(
+            tenant_id=current_user.tenant_id,
+            key=field_in.key,
+            label=field_in.label,
+            field_type=field_in.field_type,
+            required=field_in.required,
+            order=field_in.order,
+            options=field_in.options,
+            placeholder=field_in.placeholder
+        )
+        for field_in in form_in.fields
+    ]
+
+    await db.commit()
+    await FormRegistry.invalidate_form(form.website_id, form.id)
+    return await _load_form(db, form_id, current_user.tenant_id)
+
 @router.get("/forms/{form_id}/stats")
-def get_form_stats(
+async def get_form_stats(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     form_id: uuid.UUID,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
     Get aggregated stats for a form.
     """
     # Verify access
     stmt = select(Form).where(Form.id == form_id, Form.tenant_id == current_user.tenant_id)
-    if not db.execute(stmt).scalar_one_or_none():
+    if not (await db.execute(stmt)).scalar_one_or_none():
          raise HTTPException(status_code=404, detail="Form not found")
 
     # Stats Query
-    submission_count = db.query(func.count(FormSubmission.id)).filter(FormSubmission.form_id == form_id).scalar()
-    last_submission = db.query(func.max(FormSubmission.created_at)).filter(FormSubmission.form_id == form_id).scalar()
+    stmt_stats = select(
+        func.count(FormSubmission.id),
+        func.max(FormSubmission.created_at)
+    ).where(FormSubmission.form_id == form_id)
+    submission_count, last_submission = (await db.execute(stmt_stats)).one()
     
     return {
         "submission_count": submission_count,
@@ -148,80 +198,49 @@ def get_form_stats(
     }
 
 @router.get("/forms/{form_id}/submissions")
-def get_form_submissions(
+async def get_form_submissions(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     form_id: uuid.UUID,
-    skip: int = 0,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Get submissions list.
+    Get submissions list, newest first (cursor-paginated).
     """
     # Verify access
     stmt = select(Form).where(Form.id == form_id, Form.tenant_id == current_user.tenant_id)
-    if not db.execute(stmt).scalar_one_or_none():
+    if not (await db.execute(stmt)).scalar_one_or_none():
          raise HTTPException(status_code=404, detail="Form not found")
          
-    submissions = db.query(FormSubmission)\
-        .filter(FormSubmission.form_id == form_id)\
-        .order_by(desc(FormSubmission.created_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-        
-    return submissions
+    stmt_subs = select(FormSubmission).where(FormSubmission.form_id == form_id)
+    page = await paginate(db, stmt_subs, FormSubmission.created_at, FormSubmission.id, cursor, limit)
+    set_page_headers(request, response, page)
+    return page.items
 
 @router.get("/forms/{form_id}/export")
-def export_form_submissions(
+async def export_form_submissions(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     form_id: uuid.UUID,
-    current_user: User = Depends(deps.get_current_user),
+    format: ExportFormat = ExportFormat.CSV,
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Export submissions to CSV.
+    Export all submissions as CSV, gzip NDJSON, Arrow IPC or Parquet.
+    Streamed from a server-side cursor; columns follow the form's field definitions.
+    CSV keeps the "Submission ID", "Date", "IP Address" headers; the other
+    formats name those columns id, created_at and ip.
     """
     # Verify access
-    stmt = select(Form).where(Form.id == form_id, Form.tenant_id == current_user.tenant_id)
-    form = db.execute(stmt).scalar_one_or_none()
+    form = await _load_form(db, form_id, current_user.tenant_id)
     if not form:
          raise HTTPException(status_code=404, detail="Form not found")
-         
-    submissions = db.query(FormSubmission)\
-        .filter(FormSubmission.form_id == form_id)\
-        .order_by(desc(FormSubmission.created_at))\
-        .limit(1000)\
-        .all() # Cap at 1000 for safety in MVP
 
-    # Generate CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Headers logic
-    headers = ["Submission ID", "Date", "IP Address"]
-    
-    # Dynamic headers from data keys
-    keys = set()
-    for sub in submissions:
-        if sub.data:
-            keys.update(sub.data.keys())
-    sorted_keys = sorted(list(keys))
-    headers.extend(sorted_keys)
-    
-    writer.writerow(headers)
-    
-    for sub in submissions:
-        row = [str(sub.id), sub.created_at.isoformat(), sub.meta.get("ip", "") if sub.meta else ""]
-        for key in sorted_keys:
-            row.append(sub.data.get(key, ""))
-        writer.writerow(row)
-        
-    output.seek(0)
-    
-    return StreamingResponse(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=form_export_{form_id}.csv"}
+    field_keys = [field.key for field in form.fields]
+    return ExportService.streaming_response(
+        ExportService.form_submissions(form.id, field_keys), format
     )
@@ -1,25 +1,31 @@
 from typing import Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, Response
+from app.core.config import settings
+from app.core.limiter import public_client_key, public_rate_limit, get_client_ip
+from app.core.idempotency import idempotency
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
-from app.models.website import Website
-from app.models.form import Form
-from datetime import datetime
-from app.models.submission import FormSubmission
-from app.models.contact import Contact, ContactStatus
-from app.models.activity import Activity, ActivityType
+from app.models.api_key import ApiKeyScope
+from app.schemas.api_key import ApiKeyPrincipal
+from app.schemas.website import WebsiteResponse
 from app.schemas.form import FormResponse
-from app.schemas.submission import SubmissionCreate, SubmissionResponse
+from app.schemas.submission import (
+    SubmissionCreate, SubmissionResponse,
+    SubmissionBatchCreate, SubmissionBatchResponse, SubmissionBatchItemResult
+)
+from app.services.submission_service import PendingSubmission, SubmissionService
+from app.services.ingestion_service import submission_batcher
+from app.services.form_registry import FormRegistry, WebsiteEntry
+from app.services.form_validation import ValidatedSubmission
 
 router = APIRouter()
 
-def validate_origin(request: Request, website: Website):
+def validate_origin(request: Request, site: WebsiteEntry):
     """
-    Validates that the request Origin matches the Website domain.
-    In production, this should likely be stricter or handle subdomains.
-    For this implementation, we enforce strict equality or localhost for dev.
+    Validates that the request Origin (or Referer) is allowed to embed this website's forms.
+    Uses the website's precompiled allowlist: its domain (+ www.), extra hosts,
+    *.wildcard subdomains and full origins. Localhost is allowed in dev when configured.
     """
     origin = request.headers.get("origin") or request.headers.get("referer")
     if not origin:
@@ -27,147 +33,216 @@ def validate_origin(request: Request, website: Website):
         # For secure embed, we usually block or require it.
         # Strict mode: Block.
         raise HTTPException(status_code=403, detail="Missing Origin/Referer header")
-    
-    # Normalize origin (remove protocol)
-    # Simple check: does origin contain the domain?
-    # Ideally: strict host check.
-    # Allowing localhost for testing
-    if "localhost" in origin or "127.0.0.1" in origin:
-        return True
         
-    if website.domain.lower() not in origin.lower():
+    if not site.origin_matcher.matches(origin):
          raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Domain mismatch. Form allowed on: {website.domain}, Request from: {origin}"
+            detail=f"Domain mismatch. Form allowed on: {site.website.domain}, Request from: {origin}"
         )
 
-@router.get("/forms/{form_id}", response_model=FormResponse)
-def get_public_form(
+async def get_website_by_tracking_id(db: AsyncSession, tracking_id: str) -> WebsiteEntry:
+    entry = await FormRegistry.get_website(db, tracking_id)
+    if not entry or not entry.website.is_active:
+        raise HTTPException(status_code=404, detail="Invalid Tracking ID")
+    return entry
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison (RFC 9110), so W/ prefixes are ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def form_cache_headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.PUBLIC_FORM_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.PUBLIC_FORM_STALE_WHILE_REVALIDATE_SECONDS}"
+        ),
+        # The origin check makes the response depend on the embedding site
+        "Vary": "Origin",
+    }
+
+def build_pending(request: Request, website: WebsiteResponse, form: FormResponse, validated: ValidatedSubmission) -> PendingSubmission:
+    return PendingSubmission(
+        tenant_id=website.tenant_id,
+        website_id=website.id,
+        form_id=form.id,
+        form_name=form.name,
+        domain=website.domain,
+        data=validated.data,
+        meta={
+            "ip": request.client.host if request.client else None,
+            "user_agent": request.headers.get("user-agent"),
+            "referer": request.headers.get("referer")
+        },
+        email=validated.email,
+        name=validated.name,
+        phone=validated.phone,
+    )
+
+@router.get(
+    "/forms/{form_id}",
+    response_model=FormResponse,
+    dependencies=[Depends(public_rate_limit("public_form", settings.RATE_LIMIT_PUBLIC_FORM))]
+)
+async def get_public_form(
     *,
-    db: Session = Depends(deps.get_db),
-    form_id: str,
+    db: AsyncSession = Depends(deps.get_db),
+    form_id: uuid.UUID,
     tracking_id: str,
-    request: Request
+    request: Request,
+    if_none_match: Optional[str] = Header(None)
 ) -> Any:
     """
     Public Endpoint: Get form definition for rendering.
     Requires `tracking_id` to validate context.
     Origin check ensures it's embedded on the correct site.
+    Served with a strong ETag; a matching If-None-Match returns 304
+    straight from the form cache.
     """
     # 1. Find Website by Tracking ID
-    stmt = select(Website).where(Website.tracking_id == tracking_id)
-    website = db.execute(stmt).scalar_one_or_none()
-    if not website:
-        raise HTTPException(status_code=404, detail="Invalid Tracking ID")
+    site = await get_website_by_tracking_id(db, tracking_id)
+    website = site.website
         
     # 2. Security: Validate Origin
-    validate_origin(request, website)
+    validate_origin(request, site)
     
     # 3. Find Form and Validate Hierarchy
-    stmt_form = select(Form).where(
-        Form.id == form_id,
-        Form.website_id == website.id
-    )
-    form = db.execute(stmt_form).scalar_one_or_none()
-    
-    if not form:
+    entry = await FormRegistry.get_form(db, website.id, form_id)
+    if not entry:
          raise HTTPException(status_code=404, detail="Form not found or does not belong to this website")
+
+    # 4. Conditional GET / pre-serialized body
+    headers = form_cache_headers(entry.etag)
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
          
-    return form
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
-@router.post("/submissions", response_model=SubmissionResponse)
-def submit_form(
+@router.post(
+    "/submissions",
+    response_model=SubmissionResponse,
+    dependencies=[Depends(public_rate_limit("public_submit", settings.RATE_LIMIT_PUBLIC_SUBMIT))]
+)
+async def submit_form(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     submission_in: SubmissionCreate,
     tracking_id: str,
-    request: Request
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None)
 ) -> Any:
     """
     Public Endpoint: Submit a form.
+    The submission is handed to the ingestion batcher, which groups concurrent
+    submissions into multi-row inserts committed together.
+    Retries (same Idempotency-Key, or same payload within a short window) replay
+    the original response without writing again.
     """
     # 1. Reuse validation logic
-    stmt = select(Website).where(Website.tracking_id == tracking_id)
-    website = db.execute(stmt).scalar_one_or_none()
-    if not website:
-        raise HTTPException(status_code=404, detail="Invalid Tracking ID")
-    
-    validate_origin(request, website)
-    
-    stmt_form = select(Form).where(
-        Form.id == submission_in.form_id,
-        Form.website_id == website.id
-    )
-    form = db.execute(stmt_form).scalar_one_or_none()
-    if not form:
-         raise HTTPException(status_code=404, detail="Form not found")
-    
-    # 2. Contact Upsert (Atomic Logic)
-    # Search for email in the payload
-    email = submission_in.data.get("email") or submission_in.data.get("Email")
-    contact_id = None
-    
-    if email:
-        email = email.lower().strip()
-        # Try to find name/phone key
-        name = submission_in.data.get("name") or submission_in.data.get("Name") or email.split("@")[0]
-        phone = submission_in.data.get("phone") or submission_in.data.get("Phone")
-        
-        # Prepare Upsert Statement
-        insert_stmt = pg_insert(Contact).values(
-            id=uuid.uuid4(),
-            tenant_id=website.tenant_id,
-            website_id=website.id,
-            email=email,
-            name=name,
-            phone=phone,
-            source=f"Form: {form.name} ({website.domain})",
-            status=ContactStatus.NEW,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
+    site = await get_website_by_tracking_id(db, tracking_id)
+    validate_origin(request, site)
+    website = site.website
+
+    async def process() -> dict:
+        entry = await FormRegistry.get_form(db, website.id, submission_in.form_id)
+        if not entry:
+             raise HTTPException(status_code=404, detail="Form not found")
         
-        # Strategy: Passive Update (Only update 'updated_at' to confirm activity)
-        # If we wanted to update NULLs, we would use:
-        # "name": func.coalesce(Contact.name, insert_stmt.excluded.name)
-        # For now, strictly following "Existing contacts are updated (metadata), not duplicated"
-        do_update_stmt = insert_stmt.on_conflict_do_update(
-            constraint='uq_contact_tenant_email',
-            set_={
-                "updated_at": datetime.utcnow()
-            }
-        ).returning(Contact.id)
+        # 2. Validate & normalize against the form's compiled field definitions (no DB work)
+        validated = entry.validator.validate(submission_in.data)
+
+        # 3. Enqueue and wait for the batch commit
+        pending = build_pending(request, website, entry.form, validated)
+        await submission_batcher.submit(pending)
         
-        # Execute and get ID
-        result = db.execute(do_update_stmt)
-        contact_id = result.scalar_one()
+        return SubmissionResponse(id=pending.id, message="Submission received").model_dump(mode="json")
 
-    # 3. Save Submission (Raw Data)
-    submission = FormSubmission(
-        form_id=form.id,
-        website_id=website.id,
-        tenant_id=website.tenant_id,
-        data=submission_in.data,
-        meta={
-            "ip": request.client.host,
-            "user_agent": request.headers.get("user-agent"),
-            "referer": request.headers.get("referer")
-        }
+    request_key = idempotency.key_for(
+        "public_submit", tracking_id, idempotency_key,
+        submission_in.model_dump(mode="json"), get_client_ip(request)
     )
-    db.add(submission)
-    
-    # 4. Log Activity (If contact exists)
-    if contact_id:
-        activity = Activity(
-            tenant_id=website.tenant_id,
-            contact_id=contact_id,
-            type=ActivityType.FORM,
-            content=f"Submitted form '{form.name}' on {website.domain}",
-            # user_id is Nullable now
-        )
-        db.add(activity)
-    
-    db.commit()
-    db.refresh(submission)
-    
-    return SubmissionResponse(id=submission.id, message="Submission received")
+    result, replayed = await idempotency.run(request_key, process)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+@router.post("/submissions/batch", response_model=SubmissionBatchResponse)
+async def submit_form_batch(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    batch_in: SubmissionBatchCreate,
+    tracking_id: str,
+    request: Request,
+    response: Response,
+    api_key: Optional[ApiKeyPrincipal] = Depends(deps.api_key_or_rate_limit(
+        ApiKeyScope.SUBMISSIONS_WRITE.value, "public_submit_batch",
+        settings.RATE_LIMIT_PUBLIC_SUBMIT, public_client_key
+    )),
+    idempotency_key: Optional[str] = Header(None)
+) -> Any:
+    """
+    Public Endpoint: Submit many forms at once.
+    Server-side relays authenticate with an X-API-Key header (submissions:write
+    scope, key of the website's tenant, per-key rate limit) and need no Origin;
+    browsers are origin-checked like /submissions.
+    Every item is validated independently; valid ones are written in a single
+    transaction (multi-row upsert + inserts). Returns one result per item.
+    Supports Idempotency-Key like /submissions.
+    """
+    site = await get_website_by_tracking_id(db, tracking_id)
+    if api_key:
+        if api_key.tenant_id != site.website.tenant_id:
+            raise HTTPException(status_code=404, detail="Invalid Tracking ID")
+    else:
+        validate_origin(request, site)
+    website = site.website
+
+    caller = f"key:{api_key.id}" if api_key else get_client_ip(request)
+    request_key = idempotency.key_for(
+        "public_submit_batch", tracking_id, idempotency_key,
+        batch_in.model_dump(mode="json"), caller
+    )
+    result, replayed = await idempotency.run(
+        request_key, lambda: process_batch(db, request, website, batch_in)
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+async def process_batch(db: AsyncSession, request: Request, website: WebsiteResponse, batch_in: SubmissionBatchCreate) -> dict:
+    results = []
+    pending = []
+    forms = {}
+    for index, submission_in in enumerate(batch_in.submissions):
+        if submission_in.form_id not in forms:
+            forms[submission_in.form_id] = await FormRegistry.get_form(db, website.id, submission_in.form_id)
+        entry = forms[submission_in.form_id]
+        if not entry:
+            results.append(SubmissionBatchItemResult(index=index, status="rejected", errors="Form not found"))
+            continue
+
+        try:
+            validated = entry.validator.validate(submission_in.data)
+        except HTTPException as e:
+            results.append(SubmissionBatchItemResult(index=index, status="rejected", errors=e.detail))
+            continue
+
+        item = build_pending(request, website, entry.form, validated)
+        pending.append(item)
+        results.append(SubmissionBatchItemResult(index=index, status="accepted", id=item.id))
+
+    await SubmissionService.write_batch(db, pending)
+
+    return SubmissionBatchResponse(
+        accepted=len(pending),
+        rejected=len(results) - len(pending),
+        results=results
+    ).model_dump(mode="json")
@@ -0,0 +1,49 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.api import deps
+from app.models.user import User
+from app.schemas.auth import UserPrincipal, UserRead, UserUpdate
+from app.services.user_directory import UserDirectory
+import uuid
+
+router = APIRouter()
+
+@router.get("/", response_model=List[UserRead])
+async def read_users(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_active_admin),
+) -> Any:
+    """
+    Users of the tenant (admin only).
+    """
+    stmt = select(User).where(User.tenant_id == current_user.tenant_id).order_by(User.created_at)
+    return (await db.execute(stmt)).scalars().all()
+
+@router.patch("/{user_id}", response_model=UserRead)
+async def update_user(
+    user_id: uuid.UUID,
+    data: UserUpdate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: UserPrincipal = Depends(deps.get_current_active_admin),
+) -> Any:
+    """
+    Change a user's role or deactivate / reactivate them (admin only).
+    Takes effect on the user's next request, on every worker.
+    """
+    if user_id == current_user.id:
+        raise HTTPException(status_code=400, detail="You cannot change your own role or status")
+
+    stmt = select(User).where(User.id == user_id, User.tenant_id == current_user.tenant_id)
+    user = (await db.execute(stmt)).scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    for key, value in data.model_dump(exclude_unset=True).items():
+        if value is not None:
+            setattr(user, key, value)
+    await db.commit()
+    await db.refresh(user)
+    await UserDirectory.invalidate(user.id, user.tenant_id)
+    return user
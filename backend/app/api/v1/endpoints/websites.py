@@ -1,36 +1,40 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api import deps
+from app.core.pagination import paginate, set_page_headers
 from app.models.website import Website
-from app.schemas.website import WebsiteCreate, WebsiteResponse
-from app.models.user import User
+from app.schemas.website import WebsiteCreate, WebsiteResponse, WebsiteUpdate
+from app.services.form_registry import FormRegistry
+from app.schemas.auth import UserPrincipal
 import uuid
 
 router = APIRouter()
 
 @router.get("/", response_model=List[WebsiteResponse])
 async def read_websites(
-    skip: int = 0,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 100,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve websites.
+    Retrieve websites, oldest first (cursor-paginated).
     """
-    stmt = select(Website).where(Website.tenant_id == current_user.tenant_id).offset(skip).limit(limit)
-    result = await db.execute(stmt)
-    websites = result.scalars().all()
-    return websites
+    stmt = select(Website).where(Website.tenant_id == current_user.tenant_id)
+    page = await paginate(db, stmt, Website.created_at, Website.id, cursor, limit, descending=False)
+    set_page_headers(request, response, page)
+    return page.items
 
 @router.post("/", response_model=WebsiteResponse)
 async def create_website(
     *,
     db: AsyncSession = Depends(deps.get_db),
     website_in: WebsiteCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserPrincipal = Depends(deps.get_current_user),
 ) -> Any:
     """
     Register a new website.
@@ -56,6 +60,7 @@ async def create_website(
     website = Website(
         domain=website_in.domain,
         name=website_in.name,
+        allowed_origins=website_in.allowed_origins,
         tracking_id=tracking_id,
         tenant_id=current_user.tenant_id
     )
@@ -65,3 +70,36 @@ async def create_website(
     await db.refresh(website)
     
     return website
+
+@router.put("/{website_id}", response_model=WebsiteResponse)
+async def update_website(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    website_id: uuid.UUID,
+    website_in: WebsiteUpdate,
+    current_user: UserPrincipal = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Update a website's name, active flag or allowed origins.
+    """
+    stmt = select(Website).where(
+        Website.id == website_id,
+        Website.tenant_id == current_user.tenant_id
+    )
+    website = (await db.execute(stmt)).scalar_one_or_none()
+    if not website:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Website not found"
+        )
+
+    update_data = website_in.model_dump(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(website, key, value)
+
+    await db.commit()
+    await db.refresh(website)
+
+    # Public embeds resolve websites from cache by tracking_id
+    await FormRegistry.invalidate_website(website.tracking_id)
+    return website
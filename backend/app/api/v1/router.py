@@ -1,12 +1,20 @@
-from fastapi import APIRouter
-from app.api.v1.endpoints import auth, contacts, deals, activities, dashboard, websites, forms, public
+from fastapi import APIRouter, Depends
+from app.api import deps
+from app.api.v1.endpoints import auth, users, api_keys, contacts, deals, activities, dashboard, websites, forms, exports, public
+from app.core.config import settings
+
+# Authenticated routes share one token bucket per (tenant, user)
+authenticated = [Depends(deps.tenant_user_rate_limit("api", settings.RATE_LIMIT_AUTHENTICATED))]
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(contacts.router, prefix="/contacts", tags=["contacts"])
-api_router.include_router(deals.router, prefix="/deals", tags=["deals"])
-api_router.include_router(activities.router, prefix="/activities", tags=["activities"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
-api_router.include_router(websites.router, prefix="/websites", tags=["websites"])
-api_router.include_router(forms.router, tags=["forms"])
+api_router.include_router(users.router, prefix="/users", tags=["users"], dependencies=authenticated)
+api_router.include_router(api_keys.router, prefix="/api-keys", tags=["api-keys"], dependencies=authenticated)
+api_router.include_router(contacts.router, prefix="/contacts", tags=["contacts"], dependencies=authenticated)
+api_router.include_router(deals.router, prefix="/deals", tags=["deals"], dependencies=authenticated)
+api_router.include_router(activities.router, prefix="/activities", tags=["activities"], dependencies=authenticated)
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"], dependencies=authenticated)
+api_router.include_router(websites.router, prefix="/websites", tags=["websites"], dependencies=authenticated)
+api_router.include_router(forms.router, tags=["forms"], dependencies=authenticated)
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"], dependencies=authenticated)
 api_router.include_router(public.router, prefix="/public", tags=["public"]) # Note: mix of top-level and nested routes
@@ -0,0 +1,120 @@
+"""
+Maintenance commands.
+
+    python -m app.cli reconcile-stats [--tenant-id UUID]
+    python -m app.cli backfill-rollups [--tenant-id UUID]
+    python -m app.cli prune-rollups
+    python -m app.cli purge-refresh-tokens
+    python -m app.cli purge-revoked-tokens
+    python -m app.cli benchmark-password-hash [--target-ms MS]
+"""
+import argparse
+import asyncio
+import uuid
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.password_policy import benchmark
+from app.db.session import AsyncSessionLocal
+# Register every mapper (relationships are resolved by class name)
+from app.models import (  # noqa: F401
+    activity, api_key, audit, contact, deal, export_job, form, form_field, refresh_token,
+    revoked_token, rollup, submission, tenant, tenant_stats, user, webhook, website,
+)
+from app.services.revocation import RevocationList
+from app.services.rollup_service import RollupService
+from app.services.stats_service import StatsService
+from app.services.token_service import TokenService
+
+async def reconcile_stats(args):
+    async with AsyncSessionLocal() as db:
+        if args.tenant_id:
+            await StatsService.reconcile(db, args.tenant_id)
+            print(f"Reconciled stats for tenant {args.tenant_id}")
+        else:
+            count = await StatsService.reconcile_all(db)
+            print(f"Reconciled stats for {count} tenants")
+
+async def backfill_rollups(args):
+    async with AsyncSessionLocal() as db:
+        if args.tenant_id:
+            await RollupService.backfill(db, args.tenant_id)
+            print(f"Backfilled rollups for tenant {args.tenant_id}")
+        else:
+            count = await RollupService.backfill_all(db)
+            print(f"Backfilled rollups for {count} tenants")
+
+async def prune_rollups(args):
+    async with AsyncSessionLocal() as db:
+        count = await RollupService.prune_hourly(db)
+        print(f"Removed {count} expired hourly rollup rows")
+
+async def purge_refresh_tokens(args):
+    async with AsyncSessionLocal() as db:
+        count = await TokenService.purge_expired(db)
+        print(f"Removed {count} expired refresh tokens")
+
+async def purge_revoked_tokens(args):
+    async with AsyncSessionLocal() as db:
+        count = await RevocationList.purge_expired(db)
+        print(f"Removed {count} revocations of expired access tokens")
+
+async def benchmark_password_hash(args):
+    rounds, timings = await asyncio.to_thread(
+        benchmark, args.target_ms, settings.PASSWORD_HASH_MIN_ROUNDS, settings.PASSWORD_HASH_MAX_ROUNDS
+    )
+    for cost, elapsed in timings:
+        print(f"cost {cost:2d}: {elapsed:7.1f} ms")
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser(
+        "reconcile-stats",
+        help="Recompute tenant dashboard counters from the source tables (run from cron)"
+    )
+    reconcile.add_argument("--tenant-id", type=uuid.UUID, help="Only this tenant (default: all)")
+    reconcile.set_defaults(handler=reconcile_stats)
+
+    backfill = commands.add_parser(
+        "backfill-rollups",
+        help="Rebuild the dashboard trend rollups from the source tables"
+    )
+    backfill.add_argument("--tenant-id", type=uuid.UUID, help="Only this tenant (default: all)")
+    backfill.set_defaults(handler=backfill_rollups)
+
+    prune = commands.add_parser(
+        "prune-rollups",
+        help="Drop hourly rollups older than ROLLUP_HOURLY_RETENTION_DAYS (run from cron)"
+    )
+    prune.set_defaults(handler=prune_rollups)
+
+    purge = commands.add_parser(
+        "purge-refresh-tokens",
+        help="Delete expired refresh tokens (run from cron)"
+    )
+    purge.set_defaults(handler=purge_refresh_tokens)
+
+    purge_revoked = commands.add_parser(
+        "purge-revoked-tokens",
+        help="Delete revocations of access tokens that have expired (run from cron)"
+    )
+    purge_revoked.set_defaults(handler=purge_revoked_tokens)
+
+    bench = commands.add_parser(
+        "benchmark-password-hash",
+        help="Time bcrypt on this host and suggest PASSWORD_HASH_ROUNDS"
+    )
+    bench.add_argument(
+        "--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS,
+        help="Acceptable time per hash (default: PASSWORD_HASH_TARGET_MS)"
+    )
+    bench.set_defaults(handler=benchmark_password_hash)
+
+    args = parser.parse_args()
+    setup_logging()
+    asyncio.run(args.handler(args))
+
+if __name__ == "__main__":
+    main()
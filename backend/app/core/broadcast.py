@@ -0,0 +1,95 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from app.core.metrics import metrics
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Optional: only needed for cross-worker delivery
+    redis = None
+
+logger = logging.getLogger("api")
+
+class Broadcaster:
+    """
+    Fans small invalidation messages out to every worker.
+
+    Handlers in this process run immediately on `publish`. With REDIS_URL
+    configured the message is also published on a Redis pub/sub channel,
+    and every other worker delivers it to its own handlers. Delivery is
+    best effort (pub/sub does not replay missed messages), so anything
+    invalidated this way must also expire on its own.
+    """
+
+    def __init__(self, channel: str = "broadcast"):
+        self.channel = channel
+        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        # Lets a worker skip its own messages when they come back from Redis
+        self._origin = uuid.uuid4().hex
+        self._client = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], None]):
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def configure(self, redis_url: Optional[str]):
+        if redis_url:
+            if redis is None:
+                raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed")
+            self._client = redis.from_url(redis_url)
+
+    async def start(self):
+        if self._client is not None and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def publish(self, topic: str, payload: Dict[str, Any]):
+        self._deliver(topic, payload)
+        if self._client is None:
+            return
+        message = json.dumps({"origin": self._origin, "topic": topic, "payload": payload})
+        try:
+            await self._client.publish(self.channel, message)
+        except Exception as e:
+            # Other workers fall back to their cache TTL
+            metrics.incr("broadcast.publish_errors", topic=topic)
+            logger.error(f"Broadcast publish failed for {topic}: {e}")
+
+    def _deliver(self, topic: str, payload: Dict[str, Any]):
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Broadcast handler for {topic} failed: {e}")
+
+    async def _listen(self):
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("origin") == self._origin:
+                        continue
+                    metrics.incr("broadcast.received", topic=data["topic"])
+                    self._deliver(data["topic"], data["payload"])
+            except asyncio.CancelledError:
+                await asyncio.shield(pubsub.aclose())
+                raise
+            except Exception as e:
+                metrics.incr("broadcast.listen_errors")
+                logger.error(f"Broadcast listener failed, reconnecting: {e}")
+                await asyncio.gather(pubsub.aclose(), return_exceptions=True)
+                await asyncio.sleep(1)
+
+# Global Instance
+broadcaster = Broadcaster()
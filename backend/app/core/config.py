@@ -13,6 +13,113 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "CHANGE_THIS_IN_PRODUCTION_SECRET_KEY"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Opaque, single-use refresh tokens (POST /auth/refresh), rotated on every use
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # Password hashing (bcrypt) runs on a bounded thread pool; callers beyond
+    # the queue limit, or waiting longer than the timeout, get a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    # bcrypt cost for new hashes. Unset: benchmarked at startup to the highest
+    # cost within the target latency (see `python -m app.cli benchmark-password-hash`).
+    # Hashes with another cost are rehashed on the next successful login.
+    # The floor is bcrypt's default (12): a cost below it must be pinned.
+    PASSWORD_HASH_ROUNDS: Optional[int] = None
+    PASSWORD_HASH_TARGET_MS: float = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_ROUNDS: int = 15
+
+    # GET /metrics requires `Authorization: Bearer <METRICS_TOKEN>` (for scrapers);
+    # the endpoint is disabled while unset
+    METRICS_TOKEN: Optional[str] = None
+
+    # Shared state (rate limits, caches). Format: redis://host:port/db_number
+    # When unset, every worker keeps its own in-process state.
+    REDIS_URL: Optional[str] = None
+
+    # Rate Limits ("<count>/<second|minute|hour|day>", token bucket)
+    RATE_LIMIT_AUTHENTICATED: str = "600/minute"
+    RATE_LIMIT_PUBLIC_FORM: str = "120/minute"
+    RATE_LIMIT_PUBLIC_SUBMIT: str = "30/minute"
+    RATE_LIMIT_PUBLIC_LEADS: str = "5/minute"
+    RATE_LIMIT_AUTH_REFRESH: str = "30/minute"
+    # Per API key, unless the key sets its own limit
+    RATE_LIMIT_API_KEY: str = "3000/minute"
+
+    # Idempotency (Idempotency-Key header, payload fingerprint as fallback)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_FINGERPRINT_TTL_SECONDS: int = 30
+    IDEMPOTENCY_WAIT_SECONDS: int = 10
+    IDEMPOTENCY_MAX_ENTRIES: int = 100000
+
+    # Exports: rows fetched per server-side cursor round trip / encoded chunk
+    EXPORT_CHUNK_ROWS: int = 2000
+    # Background export jobs (POST /exports): files are written to local disk
+    EXPORT_STORAGE_DIR: str = "var/exports"
+    EXPORT_JOB_WORKERS: int = 2
+    EXPORT_JOB_RETENTION_HOURS: int = 24
+    # A job still "running" after this long is assumed dead and requeued at startup
+    EXPORT_JOB_STALE_MINUTES: int = 60
+
+    # Contact summary cache (GET /contacts/{id}/summary); invalidated on every
+    # worker on contact / deal / activity writes
+    CONTACT_SUMMARY_CACHE_TTL_SECONDS: int = 60
+    CONTACT_SUMMARY_CACHE_MAX_ENTRIES: int = 10000
+
+    # Dashboard response cache (per tenant + endpoint), invalidated on every
+    # worker on contact / deal / submission writes; the TTL bounds staleness
+    # if a broadcast is missed
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 10000
+
+    # Dashboard trends (daily / hourly rollups, UTC buckets)
+    ROLLUP_HOURLY_RETENTION_DAYS: int = 14
+    ROLLUP_MAX_RANGE_DAYS: int = 732
+
+    # Authenticated user cache ((user_id, tenant_id) -> role / active flag).
+    # Role and status changes are broadcast to all workers; the TTL bounds
+    # staleness if a broadcast is missed
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # Access token revocation. Each worker polls for new revocations (they are
+    # also broadcast) and rebuilds its bloom filter to drop expired entries
+    REVOCATION_REFRESH_SECONDS: int = 5
+    REVOCATION_REBUILD_MINUTES: int = 60
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
+    # API keys (server-to-server ingestion). Stored as HMAC-SHA256 keyed with
+    # API_KEY_HASH_SECRET (SECRET_KEY when unset; changing it invalidates every key).
+    # Resolved keys are cached per worker; revocations are broadcast
+    API_KEY_HASH_SECRET: Optional[str] = None
+    API_KEY_CACHE_TTL_SECONDS: int = 300
+    API_KEY_CACHE_NEGATIVE_TTL_SECONDS: int = 30
+    API_KEY_CACHE_MAX_ENTRIES: int = 10000
+
+    # Tenant Directory Cache (slug -> tenant); invalidations are broadcast to all workers
+    TENANT_CACHE_TTL_SECONDS: int = 300
+    TENANT_CACHE_NEGATIVE_TTL_SECONDS: int = 30
+    TENANT_CACHE_MAX_ENTRIES: int = 10000
+
+    # Public Form Ingestion
+    # Submissions are queued and written in multi-row batches (one commit per batch).
+    INGEST_BATCH_SIZE: int = 200
+    INGEST_FLUSH_INTERVAL_MS: int = 50
+    INGEST_QUEUE_SIZE: int = 10000
+
+    # Public Embed Cache (tracking_id -> Website, (website_id, form_id) -> Form).
+    # Edits are broadcast to all workers; the TTL bounds staleness if one is missed
+    PUBLIC_CACHE_TTL_SECONDS: int = 300
+    PUBLIC_CACHE_MAX_ENTRIES: int = 10000
+    # Accept embeds from localhost / 127.0.0.1 (local development)
+    PUBLIC_ALLOW_LOCALHOST_ORIGINS: bool = True
+    # Browser / reverse-proxy freshness for GET /public/forms/{form_id}
+    PUBLIC_FORM_MAX_AGE_SECONDS: int = 60
+    PUBLIC_FORM_STALE_WHILE_REVALIDATE_SECONDS: int = 300
+    # Max submissions accepted by POST /public/submissions/batch
+    PUBLIC_BATCH_MAX_SUBMISSIONS: int = 500
 
     class Config:
         env_file = ".env"
@@ -1,5 +1,8 @@
 from typing import Dict, List, Callable, Any
 import asyncio
+import logging
+
+logger = logging.getLogger("api")
 
 class EventDispatcher:
     _subscribers: Dict[str, List[Callable]] = {}
@@ -16,10 +19,15 @@ class EventDispatcher:
             for handler in cls._subscribers[event_name]:
                 # Fire and forget / await
                 # In real production, this might push to a queue (Kafka/Redis)
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(payload)
-                else:
-                    handler(payload)
+                # Events are dispatched after commit: a failing handler must not
+                # turn a completed write into an error for the caller.
+                try:
+                    if asyncio.iscoroutinefunction(handler):
+                        await handler(payload)
+                    else:
+                        handler(payload)
+                except Exception as e:
+                    logger.error(f"Event handler for {event_name} failed: {e}")
 
 # Global Instance
 dispatcher = EventDispatcher()
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, status
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.password_policy import password_policy
+
+logger = logging.getLogger("api")
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop.
+
+    bcrypt releases the GIL, so a small thread pool gives real parallelism
+    while the loop keeps serving other requests. At most `workers` hashes
+    run at once; up to `max_queue` callers wait for a slot, anyone beyond
+    that (or waiting longer than `queue_timeout`) gets a 503 with
+    Retry-After instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_queue: int, queue_timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            self._slots = asyncio.Semaphore(self.workers)
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", security.get_password_hash, password, password_policy.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", security.verify_password, plain_password, hashed_password)
+
+    def _report(self):
+        metrics.gauge("password_hash.queued", self._waiting)
+        metrics.gauge("password_hash.running", self._running)
+
+    def _reject(self, op: str, reason: str) -> HTTPException:
+        metrics.incr("password_hash.rejected", op=op, reason=reason)
+        logger.warning(f"Password hashing overloaded ({reason}): {self._running} running, {self._waiting} queued")
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please retry shortly",
+            headers={"Retry-After": str(max(1, round(self.queue_timeout)))}
+        )
+
+    async def _run(self, op: str, fn: Callable[..., Any], *args) -> Any:
+        self.start()
+        executor, slots = self._executor, self._slots
+        if not slots.locked():
+            # A slot is free: acquire() returns without suspending
+            await slots.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                raise self._reject(op, "queue_full")
+            self._waiting += 1
+            self._report()
+            queued_at = time.monotonic()
+            try:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject(op, "timeout")
+            finally:
+                self._waiting -= 1
+            metrics.incr("password_hash.wait_seconds", time.monotonic() - queued_at, op=op)
+
+        self._running += 1
+        self._report()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            metrics.incr("password_hash.completed", op=op)
+            return result
+        finally:
+            self._running -= 1
+            slots.release()
+            self._report()
+
+# Global Instance
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
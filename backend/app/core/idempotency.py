@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Optional: only needed for the shared store
+    redis = None
+
+logger = logging.getLogger("api")
+
+_PENDING = "__pending__"
+
+class IdempotencyStore(ABC):
+    """
+    Storage for completed responses, plus an in-flight claim so concurrent
+    duplicates wait for the first request instead of running in parallel.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the stored entry, _PENDING while in flight, or None."""
+
+    @abstractmethod
+    async def claim(self, key: str, ttl: float) -> bool:
+        """Marks the key in flight for `ttl` seconds unless it is already set."""
+
+    @abstractmethod
+    async def extend(self, key: str, ttl: float):
+        """Keeps an in-flight claim alive for another `ttl` seconds."""
+
+    @abstractmethod
+    async def save(self, key: str, entry: Dict[str, Any], ttl: float):
+        pass
+
+    @abstractmethod
+    async def release(self, key: str):
+        pass
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, maxsize: int):
+        self._entries = TTLCache(maxsize=maxsize, ttl=60)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._entries.get(key)
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        if self._entries.get(key) is not None:
+            return False
+        self._entries.set(key, _PENDING, ttl=ttl)
+        return True
+
+    async def extend(self, key: str, ttl: float):
+        if self._entries.get(key) == _PENDING:
+            self._entries.set(key, _PENDING, ttl=ttl)
+
+    async def save(self, key: str, entry: Dict[str, Any], ttl: float):
+        self._entries.set(key, entry, ttl=ttl)
+
+    async def release(self, key: str):
+        self._entries.pop(key)
+
+class RedisIdempotencyStore(IdempotencyStore):
+    def __init__(self, url: str, prefix: str = "idempotency"):
+        if redis is None:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed")
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(f"{self.prefix}:{key}")
+        if raw is None:
+            return None
+        raw = raw.decode("utf-8")
+        return _PENDING if raw == _PENDING else json.loads(raw)
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        return bool(await self._client.set(f"{self.prefix}:{key}", _PENDING, nx=True, ex=max(1, int(ttl))))
+
+    async def extend(self, key: str, ttl: float):
+        await self._client.expire(f"{self.prefix}:{key}", max(1, int(ttl)))
+
+    async def save(self, key: str, entry: Dict[str, Any], ttl: float):
+        await self._client.set(f"{self.prefix}:{key}", json.dumps(entry), ex=max(1, int(ttl)))
+
+    async def release(self, key: str):
+        await self._client.delete(f"{self.prefix}:{key}")
+
+@dataclass
+class RequestKey:
+    key: str
+    explicit: bool
+    # sha256 of the request body, stored with the response
+    fingerprint: str
+
+class Idempotency:
+    """
+    Replays the first response for a repeated request.
+
+    Requests are identified by an explicit `Idempotency-Key` header or, when the
+    client sends none, by a fingerprint of the caller and payload (short TTL:
+    this only absorbs double clicks and blind retries). Only successful
+    responses are stored. Reusing an explicit key with a different body is a
+    422, not a replay.
+    """
+
+    def __init__(self, store: IdempotencyStore, ttl: float, fingerprint_ttl: float, wait_timeout: float):
+        self.store = store
+        self.ttl = ttl
+        self.fingerprint_ttl = fingerprint_ttl
+        self.wait_timeout = wait_timeout
+
+    def configure(self, redis_url: Optional[str]):
+        """
+        Switches to the shared Redis store when a URL is configured.
+        """
+        if redis_url:
+            self.store = RedisIdempotencyStore(redis_url)
+
+    @staticmethod
+    def key_for(scope: str, namespace: str, idempotency_key: Optional[str], body: Any, caller: str) -> RequestKey:
+        """
+        An explicit key is scoped to (scope, namespace) only, so a client may
+        retry from another address; without one, the caller is part of the key.
+        """
+        fingerprint = _digest(body)
+        if idempotency_key:
+            return RequestKey(f"{scope}:{namespace}:key:{idempotency_key.strip()[:255]}", True, fingerprint)
+        return RequestKey(f"{scope}:{namespace}:fp:{_digest([caller, fingerprint])}", False, fingerprint)
+
+    async def run(
+        self,
+        request_key: RequestKey,
+        handler: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Returns (response, replayed).
+        """
+        key = request_key.key
+        ttl = self.ttl if request_key.explicit else self.fingerprint_ttl
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+
+        try:
+            while True:
+                stored = await self.store.get(key)
+                if stored is not None and stored != _PENDING:
+                    if stored["fingerprint"] != request_key.fingerprint:
+                        metrics.incr("idempotency.mismatched")
+                        raise HTTPException(
+                            status_code=422,
+                            detail="Idempotency-Key was already used with a different request body"
+                        )
+                    metrics.incr("idempotency.replayed")
+                    return stored["response"], True
+                if stored is None and await self.store.claim(key, self.wait_timeout):
+                    break
+                # Another request with the same key is in flight
+                if loop.time() >= deadline:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A request with the same idempotency key is still being processed"
+                    )
+                await asyncio.sleep(0.05)
+        except HTTPException:
+            raise
+        except Exception as e:
+            # Fail open: process the request without deduplication
+            metrics.incr("idempotency.store_errors")
+            logger.error(f"Idempotency store error: {e}")
+            return await handler(), False
+
+        # The claim only lasts wait_timeout (so a crashed worker cannot block a
+        # key for long); keep it alive for as long as the handler runs
+        holder = asyncio.create_task(self._hold(key))
+        try:
+            response = await handler()
+        except BaseException:
+            await _cancel(holder)
+            try:
+                await self.store.release(key)
+            except Exception as e:
+                # The claim expires on its own; the handler's error is what the caller needs
+                metrics.incr("idempotency.store_errors")
+                logger.error(f"Idempotency store error: {e}")
+            raise
+        await _cancel(holder)
+
+        try:
+            await self.store.save(key, {"fingerprint": request_key.fingerprint, "response": response}, ttl)
+        except Exception as e:
+            logger.error(f"Idempotency store error: {e}")
+        return response, False
+
+    async def _hold(self, key: str):
+        while True:
+            await asyncio.sleep(self.wait_timeout / 3)
+            try:
+                await self.store.extend(key, self.wait_timeout)
+            except Exception as e:
+                logger.error(f"Idempotency store error: {e}")
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+async def _cancel(task: asyncio.Task):
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+# Global Instance
+idempotency = Idempotency(
+    InMemoryIdempotencyStore(maxsize=settings.IDEMPOTENCY_MAX_ENTRIES),
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    fingerprint_ttl=settings.IDEMPOTENCY_FINGERPRINT_TTL_SECONDS,
+    wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+)
@@ -1,16 +1,176 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import Request
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from app.core.cache import TTLCache
+from app.core.metrics import metrics
 
-def get_tenant_user_key(request: Request) -> str:
+try:
+    import redis.asyncio as redis
+except ImportError:  # Optional: only needed for the shared store
+    redis = None
+
+logger = logging.getLogger("api")
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+class Rate:
+    """
+    A token bucket definition parsed from "<count>/<period>", e.g. "5/minute".
+    `capacity` tokens refill evenly over the period (burst == count).
+    """
+
+    def __init__(self, spec: str):
+        count, _, period = spec.partition("/")
+        if period not in _PERIODS:
+            raise ValueError(f"Invalid rate limit: {spec}")
+        self.spec = spec
+        self.capacity = int(count)
+        self.refill_per_second = self.capacity / _PERIODS[period]
+
+@lru_cache(maxsize=1024)
+def parse_rate(spec: str) -> Rate:
+    """
+    Shared Rate per spec, for limits that are only known per request (e.g. per API key).
+    """
+    return Rate(spec)
+
+class BucketStore(ABC):
+    """
+    Storage backend for token buckets. `consume` must be atomic per key.
+    Returns (allowed, retry_after_seconds).
+    """
+
+    @abstractmethod
+    async def consume(self, key: str, rate: Rate, cost: int = 1) -> Tuple[bool, float]:
+        pass
+
+class InMemoryBucketStore(BucketStore):
+    """
+    Per-process store. Fine for tests and single-worker deployments only:
+    with N workers the effective limit is N times higher.
+    """
+
+    def __init__(self, maxsize: int = 100000):
+        # An idle bucket is dropped once it would be full again anyway
+        self._buckets = TTLCache(maxsize=maxsize, ttl=3600)
+
+    async def consume(self, key: str, rate: Rate, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (rate.capacity, now))
+        tokens = min(rate.capacity, tokens + (now - updated_at) * rate.refill_per_second)
+
+        allowed = tokens >= cost
+        retry_after = 0.0
+        if allowed:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate.refill_per_second
+
+        self._buckets.set(key, (tokens, now), ttl=rate.capacity / rate.refill_per_second)
+        return allowed, retry_after
+
+# Refill + consume in one round trip; uses the Redis clock so all workers agree.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(retry)}
+"""
+
+class RedisBucketStore(BucketStore):
+    """
+    Shared store: buckets live in Redis, so limits hold across all workers.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit"):
+        if redis is None:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed")
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def consume(self, key: str, rate: Rate, cost: int = 1) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[rate.capacity, rate.refill_per_second, cost]
+        )
+        return bool(int(allowed)), float(retry_after)
+
+class RateLimiter:
+    def __init__(self, store: BucketStore):
+        self.store = store
+
+    def configure(self, redis_url: Optional[str]):
+        """
+        Switches to the shared Redis store when a URL is configured.
+        """
+        if redis_url:
+            self.store = RedisBucketStore(redis_url)
+
+    async def hit(self, scope: str, key: str, rate: Rate, cost: int = 1):
+        """
+        Consumes from the bucket for (scope, key); raises 429 when empty.
+        """
+        try:
+            allowed, retry_after = await self.store.consume(f"{scope}:{key}", rate, cost)
+        except Exception as e:
+            # Fail open: a store outage must not take the API down with it
+            metrics.incr("rate_limit.store_errors", scope=scope)
+            logger.error(f"Rate limit store error: {e}")
+            return
+
+        if not allowed:
+            metrics.incr("rate_limit.throttled", scope=scope)
+            logger.warning(f"Rate limit exceeded: scope={scope} key={key} limit={rate.spec}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {rate.spec}",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+
+limiter = RateLimiter(InMemoryBucketStore())
+
+def get_client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def rate_limit(scope: str, spec: str, key_func: Callable[[Request], str]):
+    """
+    Factory for a dependency that enforces `spec` on the key built by `key_func`.
+    """
+    rate = Rate(spec)
+
+    async def dependency(request: Request):
+        await limiter.hit(scope, key_func(request), rate)
+    return dependency
+
+def public_client_key(request: Request) -> str:
+    return f"{get_client_ip(request)}:{request.query_params.get('tracking_id', '')}"
+
+def public_rate_limit(scope: str, spec: str):
     """
-    Custom key builder for Rate Limiting.
-    If authenticated, limit by (Tenant + User).
-    If public, limit by IP.
+    Public routes: one bucket per (client IP, tracking_id).
     """
-    # This logic relies on Request.state which we might populate in middleware
-    # Or strict IP fallback for now.
-    return get_remote_address(request)
+    return rate_limit(scope, spec, public_client_key)
 
-limiter = Limiter(key_func=get_remote_address)
+def ip_rate_limit(scope: str, spec: str):
+    return rate_limit(scope, spec, get_client_ip)
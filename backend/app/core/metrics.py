@@ -0,0 +1,30 @@
+from collections import defaultdict
+from typing import Dict
+
+def _series(name: str, labels: Dict[str, str]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+class Metrics:
+    """
+    Minimal in-process counters and gauges.
+    Exposed as JSON on GET /metrics; per worker, not aggregated.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1, **labels):
+        self._counters[_series(name, labels)] += value
+
+    def gauge(self, name: str, value: float, **labels):
+        self._gauges[_series(name, labels)] = value
+
+    def snapshot(self) -> dict:
+        return {"counters": dict(self._counters), "gauges": dict(self._gauges)}
+
+# Global Instance
+metrics = Metrics()
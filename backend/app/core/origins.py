@@ -0,0 +1,76 @@
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+class OriginMatcher:
+    """
+    Allowlist for embedded form requests, parsed once per website.
+
+    Entries:
+    - "example.com"            exact host (the website domain and its www. host are implicit)
+    - "*.example.com"          any subdomain of example.com
+    - "https://app.example.com:8443"  exact origin (scheme + host + port)
+
+    Every check is a handful of set lookups (one per host label for wildcards).
+    """
+
+    def __init__(self, domain: str, allowed_origins: Iterable[str] = (), allow_localhost: bool = False):
+        domain = domain.lower().strip().removeprefix("www.")
+        self.allow_localhost = allow_localhost
+        self.hosts = {domain, f"www.{domain}"}
+        self.wildcards = set()
+        self.origins = set()
+
+        for entry in allowed_origins:
+            entry = entry.lower().strip()
+            if not entry:
+                continue
+            if "://" in entry:
+                origin = self._origin(entry)
+                if origin:
+                    self.origins.add(origin)
+            elif entry.startswith("*."):
+                self.wildcards.add(entry[2:])
+            else:
+                self.hosts.add(entry)
+
+    @staticmethod
+    def _origin(value: str) -> Optional[str]:
+        try:
+            parts = urlsplit(value)
+        except ValueError:
+            return None
+        if not parts.scheme or not parts.hostname:
+            return None
+        port = f":{parts.port}" if parts.port else ""
+        return f"{parts.scheme}://{parts.hostname}{port}"
+
+    def matches(self, origin: str) -> bool:
+        """
+        `origin` is an Origin header or a full Referer URL.
+        """
+        try:
+            parts = urlsplit(origin.strip().lower())
+            host = parts.hostname
+            port = parts.port
+        except ValueError:
+            return False
+        if not host:
+            return False
+
+        if self.allow_localhost and host in LOCAL_HOSTS:
+            return True
+        if host in self.hosts:
+            return True
+        if self.origins and f"{parts.scheme}://{host}{f':{port}' if port else ''}" in self.origins:
+            return True
+
+        # Wildcards: test each parent domain of the host
+        if self.wildcards:
+            dot = host.find(".")
+            while dot != -1:
+                if host[dot + 1:] in self.wildcards:
+                    return True
+                dot = host.find(".", dot + 1)
+        return False
@@ -0,0 +1,137 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 500
+
+_FORWARD = "n"
+_BACKWARD = "p"
+
+def pack_cursor(values: List[Any]) -> str:
+    """
+    Opaque, URL-safe token for a list of JSON-serializable key values.
+    """
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def unpack_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+def _dump_key(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+def _load_key(value: Any) -> Any:
+    if isinstance(value, dict) and "t" in value:
+        return datetime.fromisoformat(value["t"])
+    if isinstance(value, dict) and "n" in value:
+        return Decimal(value["n"])
+    return value
+
+def encode_cursor(direction: str, sort_key: str, value: Any, id_: uuid.UUID) -> str:
+    return pack_cursor([direction, sort_key, _dump_key(value), str(id_)])
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[str, Any, uuid.UUID]:
+    direction, key, value, id_ = unpack_cursor(cursor, 4)
+    try:
+        # A cursor is only valid for the ordering it was issued for
+        if direction not in (_FORWARD, _BACKWARD) or key != sort_key:
+            raise ValueError(direction)
+        return direction, _load_key(value), uuid.UUID(id_)
+    except (ArithmeticError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+class Page(Generic[T]):
+    def __init__(self, items: List[T], next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+async def paginate(
+    db: AsyncSession,
+    stmt,
+    sort_col,
+    id_col,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = True
+) -> Page:
+    """
+    Keyset pagination on (sort_col, id), usually (created_at, id).
+
+    Instead of OFFSET, each page continues from the key of the last row seen,
+    so page N costs the same as page 1 as long as an index on
+    (<scope>, sort_col) exists. `stmt` must be an ORM select of one entity
+    with no ORDER BY; sort_col must be non-null.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sort_key = f"-{sort_col.key}" if descending else sort_col.key
+    key = tuple_(sort_col, id_col)
+
+    # Walking backwards = walking the reversed order, then flipping the rows
+    reverse = False
+    if cursor:
+        direction, value, id_ = decode_cursor(cursor, sort_key)
+        reverse = direction == _BACKWARD
+        after = descending != reverse
+        bound = (value, id_)
+        stmt = stmt.where(key < bound if after else key > bound)
+
+    order_desc = descending != reverse
+    if order_desc:
+        stmt = stmt.order_by(sort_col.desc(), id_col.desc())
+    else:
+        stmt = stmt.order_by(sort_col.asc(), id_col.asc())
+
+    rows = (await db.execute(stmt.limit(limit + 1))).scalars().all()
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    if reverse:
+        items.reverse()
+
+    def cursor_for(direction: str, item: Any) -> str:
+        return encode_cursor(direction, sort_key, getattr(item, sort_col.key), item.id)
+
+    next_cursor = prev_cursor = None
+    if items:
+        if reverse:
+            next_cursor = cursor_for(_FORWARD, items[-1])
+            prev_cursor = cursor_for(_BACKWARD, items[0]) if has_more else None
+        else:
+            next_cursor = cursor_for(_FORWARD, items[-1]) if has_more else None
+            prev_cursor = cursor_for(_BACKWARD, items[0]) if cursor else None
+    return Page(items, next_cursor, prev_cursor)
+
+def set_page_headers(request: Request, response: Response, page: Page):
+    """
+    Cursors travel in headers (X-Next-Cursor / X-Prev-Cursor and an RFC 8288
+    Link header), so list bodies keep their plain-array shape.
+    """
+    links = []
+    for rel, cursor, header in (
+        ("next", page.next_cursor, "X-Next-Cursor"),
+        ("prev", page.prev_cursor, "X-Prev-Cursor"),
+    ):
+        if cursor:
+            response.headers[header] = cursor
+            links.append(f'<{request.url.include_query_params(cursor=cursor)}>; rel="{rel}"')
+    if links:
+        response.headers["Link"] = ", ".join(links)
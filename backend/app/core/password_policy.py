@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+import bcrypt
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger("api")
+
+def cost_of(hashed_password: str) -> Optional[int]:
+    """
+    The work factor recorded in a bcrypt hash ("$2b$<cost>$<salt+digest>").
+    """
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def benchmark(target_ms: float, min_rounds: int, max_rounds: int) -> Tuple[int, List[Tuple[int, float]]]:
+    """
+    Times one hash per cost from `min_rounds` up (each step doubles the work)
+    and returns the highest cost that stays within `target_ms`, plus the
+    (cost, milliseconds) timings measured. Never goes below `min_rounds`.
+    """
+    rounds = min_rounds
+    timings = []
+    for cost in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"benchmark-password", bcrypt.gensalt(rounds=cost))
+        elapsed = (time.perf_counter() - started) * 1000
+        timings.append((cost, elapsed))
+        if elapsed > target_ms:
+            break
+        rounds = cost
+    return rounds, timings
+
+class PasswordPolicy:
+    """
+    The bcrypt work factor for new hashes.
+
+    Pinned with PASSWORD_HASH_ROUNDS (what production should do, with the
+    value suggested by `python -m app.cli benchmark-password-hash`), or
+    picked at startup by benchmarking this host against
+    PASSWORD_HASH_TARGET_MS.
+
+    Each hash records its own cost, so old hashes keep verifying and are
+    rehashed on the next successful login. A benchmarked cost only ever
+    upgrades hashes: workers on different hardware may measure different
+    costs and must not rehash the same user back and forth. Lowering the
+    cost on purpose requires pinning it.
+    """
+
+    def __init__(self, rounds: Optional[int], target_ms: float, min_rounds: int, max_rounds: int):
+        self.pinned = rounds is not None
+        self.rounds = rounds if rounds is not None else min_rounds
+        self.target_ms = target_ms
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+
+    async def configure(self):
+        if not self.pinned:
+            self.rounds, timings = await asyncio.to_thread(
+                benchmark, self.target_ms, self.min_rounds, self.max_rounds
+            )
+            rendered = ", ".join(f"{cost}={elapsed:.0f}ms" for cost, elapsed in timings)
+            logger.info(f"Password hash cost {self.rounds} for a {self.target_ms:.0f}ms target ({rendered})")
+        metrics.gauge("password_hash.rounds", self.rounds)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        cost = cost_of(hashed_password)
+        if cost is None:
+            return True
+        return cost < self.rounds or (self.pinned and cost != self.rounds)
+
+# Global Instance
+password_policy = PasswordPolicy(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    target_ms=settings.PASSWORD_HASH_TARGET_MS,
+    min_rounds=settings.PASSWORD_HASH_MIN_ROUNDS,
+    max_rounds=settings.PASSWORD_HASH_MAX_ROUNDS,
+)
@@ -1,5 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Optional, Any, Union
+import hashlib
+import hmac
+import secrets
+import uuid
 import jwt
 import bcrypt
 from app.core.config import settings
@@ -25,10 +29,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         # Handle cases where hashed_password might be invalid formatting
         return False
 
-def get_password_hash(password: str) -> str:
-    # salt is generated automatically by gensalt
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    # salt is generated automatically by gensalt; the cost is recorded in the hash
     pwd_bytes = _prepare_password(password)
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds) if rounds else bcrypt.gensalt()
     return bcrypt.hashpw(pwd_bytes, salt).decode("utf-8")
 
 def create_access_token(subject: Union[str, Any], tenant_id: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -37,6 +41,31 @@ def create_access_token(subject: Union[str, Any], tenant_id: str, expires_delta:
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"sub": str(subject), "tenant_id": tenant_id, "exp": expire}
+    # jti identifies this token for revocation (see RevocationList)
+    to_encode = {
+        "sub": str(subject), "tenant_id": tenant_id, "exp": expire,
+        "iat": datetime.utcnow(), "jti": uuid.uuid4().hex
+    }
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+def create_refresh_token() -> str:
+    """
+    Opaque refresh token (256 bits of randomness). Only its hash is stored.
+    """
+    return secrets.token_urlsafe(32)
+
+def hash_token(token: str) -> str:
+    # Tokens are random, not user-chosen: a fast hash is enough (no bcrypt)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def create_api_key() -> str:
+    """
+    Opaque API key (256 bits of randomness). Shown once; only its HMAC is stored.
+    """
+    return f"crm_{secrets.token_urlsafe(32)}"
+
+def hash_api_key(key: str) -> str:
+    # Keyed, so a leaked table cannot be checked against candidate keys offline
+    secret = settings.API_KEY_HASH_SECRET or settings.SECRET_KEY
+    return hmac.new(secret.encode("utf-8"), key.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -1,12 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.core.limiter import limiter
+from app.core.idempotency import idempotency
+from app.core.hashing import password_hasher
+from app.core.password_policy import password_policy
+from app.core.broadcast import broadcaster
 from app.core.logging import setup_logging
+from app.services.ingestion_service import submission_batcher
+from app.services.export_jobs import export_jobs
+from app.services.revocation import revocation_list
 
 app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json")
 
@@ -23,19 +26,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor pagination headers must be readable by the browser app
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "Link"],
 )
 
-# State & Middleware
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 from app.core.errors import global_exception_handler
 app.add_exception_handler(Exception, global_exception_handler)
 
 @app.on_event("startup")
 async def startup():
     setup_logging()
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
+    limiter.configure(settings.REDIS_URL)
+    idempotency.configure(settings.REDIS_URL)
+    broadcaster.configure(settings.REDIS_URL)
+    await broadcaster.start()
+    password_hasher.start()
+    await password_policy.configure()
+    await submission_batcher.start()
+    await export_jobs.start()
+    await revocation_list.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Flush queued public submissions before the worker exits
+    await submission_batcher.stop()
+    await export_jobs.stop()
+    await revocation_list.stop()
+    password_hasher.stop()
+    await broadcaster.stop()
 
 # Placeholder for Include Routers
 from app.api.v1.router import api_router
@@ -18,6 +18,7 @@ class Activity(Base):
     content = Column(Text, nullable=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Tenant Scope
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False, index=True)
@@ -28,4 +29,7 @@ class Activity(Base):
 
     __table_args__ = (
         Index('ix_activity_tenant_created', 'tenant_id', 'created_at'),
+        Index('ix_activity_tenant_updated', 'tenant_id', 'updated_at'),
+        Index('ix_activity_contact_created', 'contact_id', 'created_at'),
+        Index('ix_activity_tenant_type', 'tenant_id', 'type'),
     )
@@ -0,0 +1,28 @@
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+class ApiKeyScope(str, enum.Enum):
+    LEADS_WRITE = "leads:write"
+    SUBMISSIONS_WRITE = "submissions:write"
+
+class ApiKey(Base):
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(100), nullable=False)
+    # First characters of the key, shown in listings so admins can tell keys apart
+    prefix = Column(String(16), nullable=False)
+    # HMAC-SHA256 of the key (see security.hash_api_key); the key itself is never stored
+    key_hash = Column(String(64), nullable=False, unique=True)
+    scopes = Column(JSON, nullable=False)  # List of ApiKeyScope values ["leads:write"]
+    # Token bucket for this key ("<count>/<period>"); NULL means RATE_LIMIT_API_KEY
+    rate_limit = Column(String(32), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    revoked_at = Column(DateTime, nullable=True)
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+
+    # Tenant Scope
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False, index=True)
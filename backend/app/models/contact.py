@@ -1,9 +1,9 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Index, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Enum, Index, UniqueConstraint, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.db.base import Base
 
 class ContactStatus(str, enum.Enum):
@@ -12,6 +12,19 @@ class ContactStatus(str, enum.Enum):
     QUALIFIED = "qualified"
     LOST = "lost"
 
+# Lowercased haystack for trigram matching; phone is added digits-only as well
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || "
+    "regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') || ' ' || coalesce(source, ''))"
+)
+# Weighted document for ranked full-text matching ('simple': names are not stemmed)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(email, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(phone, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(source, '')), 'C')"
+)
+
 class Contact(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -30,6 +43,11 @@ class Contact(Base):
     # Website Scope (Ownership)
     website_id = Column(UUID(as_uuid=True), ForeignKey("website.id"), nullable=False, index=True)
 
+    # Search columns, maintained by Postgres (see ContactService.search).
+    # Deferred: never loaded unless explicitly selected.
+    search_text = deferred(Column(Text, Computed(SEARCH_TEXT_SQL, persisted=True)))
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
     # Relationships
     website = relationship("Website", back_populates="contacts")
     # deals = relationship("Deal", back_populates="contact")
@@ -39,5 +57,12 @@ class Contact(Base):
     __table_args__ = (
         Index('ix_contact_tenant_email', 'tenant_id', 'email'),
         Index('ix_contact_tenant_created', 'tenant_id', 'created_at'),
+        Index('ix_contact_tenant_updated', 'tenant_id', 'updated_at'),
+        Index('ix_contact_tenant_name', 'tenant_id', 'name'),
+        Index('ix_contact_tenant_status', 'tenant_id', 'status'),
         UniqueConstraint('tenant_id', 'email', name='uq_contact_tenant_email'),
+        # Tenant-leading GIN indexes (btree_gin) so search never scans other tenants' rows
+        Index('ix_contact_search_trgm', 'tenant_id', 'search_text', postgresql_using='gin',
+              postgresql_ops={'search_text': 'gin_trgm_ops'}),
+        Index('ix_contact_search_vector', 'tenant_id', 'search_vector', postgresql_using='gin'),
     )
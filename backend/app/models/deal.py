@@ -12,6 +12,9 @@ class DealStage(str, enum.Enum):
     WON = "won"
     LOST = "lost"
 
+# Stages that take a deal out of the open pipeline
+CLOSED_STAGES = (DealStage.WON, DealStage.LOST)
+
 class Deal(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
@@ -20,6 +23,8 @@ class Deal(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # When the deal entered its current won / lost stage (None while open)
+    closed_at = Column(DateTime, nullable=True)
 
     # Tenant Scope
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False, index=True)
@@ -30,4 +35,7 @@ class Deal(Base):
 
     __table_args__ = (
         Index('ix_deal_tenant_created', 'tenant_id', 'created_at'),
+        Index('ix_deal_tenant_updated', 'tenant_id', 'updated_at'),
+        Index('ix_deal_tenant_value', 'tenant_id', 'value'),
+        Index('ix_deal_tenant_stage', 'tenant_id', 'stage'),
     )
@@ -0,0 +1,41 @@
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, Text, BigInteger, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+class ExportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ExportJob(Base):
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # What to export
+    dataset = Column(String, nullable=False)   # ExportKind
+    format = Column(String, nullable=False)    # ExportFormat
+    form_id = Column(UUID(as_uuid=True), ForeignKey("form.id", ondelete="CASCADE"), nullable=True)
+
+    # Hash of the dataset's row count / last change; equal fingerprints => the file can be reused
+    fingerprint = Column(String(64), nullable=False)
+
+    status = Column(Enum(ExportJobStatus), default=ExportJobStatus.PENDING, nullable=False)
+    file_path = Column(String, nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    # Tenant Scope
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=True)
+
+    __table_args__ = (
+        Index('ix_exportjob_tenant_fingerprint', 'tenant_id', 'dataset', 'format', 'fingerprint'),
+        Index('ix_exportjob_status_created', 'status', 'created_at'),
+    )
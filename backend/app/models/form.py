@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -20,3 +20,7 @@ class Form(Base):
     tenant = relationship("Tenant")
     website = relationship("Website", back_populates="forms")
     fields = relationship("FormField", back_populates="form", cascade="all, delete-orphan", order_by="FormField.order")
+
+    __table_args__ = (
+        Index('ix_form_website_created', 'website_id', 'created_at'),
+    )
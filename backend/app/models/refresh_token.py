@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+class RefreshToken(Base):
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # sha256 of the opaque token; the token itself is never stored
+    token_hash = Column(String(64), nullable=False, unique=True)
+    # Every token minted by rotating the same login shares a family
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    # Set when the token is exchanged; presenting it again means it leaked
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index('ix_refreshtoken_expires', 'expires_at'),
+    )
@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+# Access tokens (by `jti` claim) revoked before their expiry. Workers mirror
+# the live rows in a bloom filter (see RevocationList); rows can be purged
+# once `expires_at` has passed.
+class RevokedToken(Base):
+    jti = Column(String(64), primary_key=True)
+    # Workers poll for rows newer than their last refresh
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=True)
@@ -0,0 +1,38 @@
+import enum
+from sqlalchemy import Column, String, BigInteger, Numeric, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+class RollupMetric(str, enum.Enum):
+    CONTACTS_CREATED = "contacts_created"
+    # dimension = form id
+    SUBMISSIONS = "submissions"
+    # Bucketed by Deal.closed_at; value = deal value
+    DEALS_WON = "deals_won"
+    DEALS_LOST = "deals_lost"
+    # Net change of the open pipeline: +1 / +value when a deal is created,
+    # -1 / -value when it closes. Running sums give open deals / value over time.
+    PIPELINE = "pipeline"
+
+# Trend series, maintained in the same transaction as the source writes
+# (see RollupService) and rebuilt by `python -m app.cli backfill-rollups`.
+# Buckets are UTC. The primary key (tenant, metric, bucket, dimension)
+# serves every trend query as a single range scan.
+class DailyRollup(Base):
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String, primary_key=True)
+    bucket = Column(Date, primary_key=True)
+    dimension = Column(String, primary_key=True, default="", server_default="")
+
+    count = Column(BigInteger, default=0, nullable=False, server_default="0")
+    value = Column(Numeric, default=0, nullable=False, server_default="0")
+
+# Same series at hour resolution, kept for ROLLUP_HOURLY_RETENTION_DAYS
+class HourlyRollup(Base):
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    dimension = Column(String, primary_key=True, default="", server_default="")
+
+    count = Column(BigInteger, default=0, nullable=False, server_default="0")
+    value = Column(Numeric, default=0, nullable=False, server_default="0")
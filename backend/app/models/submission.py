@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -23,3 +23,7 @@ class FormSubmission(Base):
     tenant = relationship("Tenant")
     website = relationship("Website")
     form = relationship("Form")
+
+    __table_args__ = (
+        Index('ix_formsubmission_form_created', 'form_id', 'created_at'),
+    )
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Numeric, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+# Per-tenant counters, maintained in the same transaction as contact and deal
+# writes (see StatsService) and reconciled against the source tables.
+class TenantStats(Base):
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
+
+    contact_count = Column(BigInteger, default=0, nullable=False, server_default="0")
+
+    # Deals by stage: count and summed value
+    lead_count = Column(BigInteger, default=0, nullable=False, server_default="0")
+    lead_value = Column(Numeric, default=0, nullable=False, server_default="0")
+    proposal_count = Column(BigInteger, default=0, nullable=False, server_default="0")
+    proposal_value = Column(Numeric, default=0, nullable=False, server_default="0")
+    won_count = Column(BigInteger, default=0, nullable=False, server_default="0")
+    won_value = Column(Numeric, default=0, nullable=False, server_default="0")
+    lost_count = Column(BigInteger, default=0, nullable=False, server_default="0")
+    lost_value = Column(Numeric, default=0, nullable=False, server_default="0")
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    reconciled_at = Column(DateTime, nullable=True)
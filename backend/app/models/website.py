@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -12,6 +12,8 @@ class Website(Base):
     tracking_id = Column(String, unique=True, nullable=True)
     is_active = Column(Boolean, default=True)
     is_system = Column(Boolean, default=False, nullable=False)
+    # Extra origins allowed to embed forms: hosts, "*.example.com" wildcards or full origins
+    allowed_origins = Column(JSONB, default=list, nullable=False, server_default="[]")
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Ownership
@@ -24,4 +26,5 @@ class Website(Base):
 
     __table_args__ = (
         UniqueConstraint('tenant_id', 'domain', name='uq_website_tenant_domain'),
+        Index('ix_website_tenant_created', 'tenant_id', 'created_at'),
     )
@@ -0,0 +1,46 @@
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from app.core.limiter import Rate
+from app.models.api_key import ApiKeyScope
+
+class ApiKeyCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100, description="What the key is for (e.g. the integration's name)")
+    scopes: List[ApiKeyScope] = Field(default_factory=lambda: [ApiKeyScope.LEADS_WRITE], min_length=1)
+    rate_limit: Optional[str] = Field(None, max_length=32, description="Token bucket for this key, e.g. 6000/minute (default: RATE_LIMIT_API_KEY)")
+
+    @field_validator('rate_limit')
+    @classmethod
+    def validate_rate_limit(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and Rate(v).capacity < 1:  # Rate raises ValueError on bad specs
+            raise ValueError("Rate limit must allow at least one request")
+        return v
+
+class ApiKeyRead(BaseModel):
+    id: UUID
+    name: str
+    prefix: str
+    scopes: List[str]
+    rate_limit: Optional[str] = None
+    created_at: datetime
+    revoked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ApiKeyCreated(ApiKeyRead):
+    # Returned once, at creation; only its hash is kept
+    key: str
+
+class ApiKeyPrincipal(BaseModel):
+    """
+    An authenticated API key as seen by scope / rate limit checks (cached per process).
+    """
+    id: UUID
+    tenant_id: UUID
+    scopes: List[str]
+    rate_limit: Optional[str] = None
+
+    class Config:
+        from_attributes = True
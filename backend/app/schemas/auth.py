@@ -1,6 +1,7 @@
 from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, constr, Field
+from app.models.user import UserRole
 
 # Shared properties
 class TenantBase(BaseModel):
@@ -35,6 +36,23 @@ class UserRead(UserBase):
     class Config:
         from_attributes = True
 
+class UserUpdate(BaseModel):
+    role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+
+class UserPrincipal(BaseModel):
+    """
+    The authenticated user as seen by authorization checks (cached per process).
+    """
+    id: UUID
+    tenant_id: UUID
+    email: str
+    role: UserRole
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
 # Auth Payloads
 class AuthRegister(BaseModel):
     company_name: str
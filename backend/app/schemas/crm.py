@@ -76,7 +76,7 @@ class ActivityRead(ActivityBase):
     id: str
     tenant_id: str
     contact_id: str
-    user_id: str
+    user_id: Optional[str] = None  # None for system activities (form submissions)
     created_at: str
 
     class Config:
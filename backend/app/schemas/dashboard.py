@@ -0,0 +1,15 @@
+import enum
+from datetime import datetime
+from pydantic import BaseModel
+
+class TrendInterval(str, enum.Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+class TrendPoint(BaseModel):
+    # Start of the bucket (UTC)
+    bucket: datetime
+    count: int = 0
+    value: float = 0
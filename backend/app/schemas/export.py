@@ -0,0 +1,44 @@
+import enum
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, model_validator
+from app.models.export_job import ExportJobStatus
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"      # gzip-compressed newline-delimited JSON
+    ARROW = "arrow"        # Arrow IPC stream (requires pyarrow)
+    PARQUET = "parquet"    # Parquet (requires pyarrow)
+
+class ExportKind(str, enum.Enum):
+    FORM_SUBMISSIONS = "form_submissions"
+    CONTACTS = "contacts"
+    DEALS = "deals"
+    ACTIVITIES = "activities"
+
+class ExportJobCreate(BaseModel):
+    dataset: ExportKind
+    format: ExportFormat = ExportFormat.CSV
+    form_id: Optional[UUID] = None  # Required for form_submissions
+
+    @model_validator(mode="after")
+    def check_form_id(self):
+        if self.dataset == ExportKind.FORM_SUBMISSIONS and self.form_id is None:
+            raise ValueError("form_id is required for form_submissions exports")
+        return self
+
+class ExportJobRead(BaseModel):
+    id: UUID
+    dataset: ExportKind
+    format: ExportFormat
+    form_id: Optional[UUID] = None
+    status: ExportJobStatus
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -2,7 +2,7 @@ from pydantic import BaseModel, EmailStr, constr
 from typing import Optional
 
 class PublicLeadCreate(BaseModel):
-    tenant_slug: str
+    tenant_slug: Optional[str] = None  # Required without an API key; a key implies its tenant
     name: str
     email: EmailStr
     phone: Optional[str] = None
@@ -1,6 +1,7 @@
-from typing import Any, Dict
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
 from uuid import UUID
+from app.core.config import settings
 
 class SubmissionCreate(BaseModel):
     form_id: UUID
@@ -9,3 +10,20 @@ class SubmissionCreate(BaseModel):
 class SubmissionResponse(BaseModel):
     id: UUID
     message: str
+
+# Batch (server-side relays)
+class SubmissionBatchCreate(BaseModel):
+    submissions: List[SubmissionCreate] = Field(
+        ..., min_length=1, max_length=settings.PUBLIC_BATCH_MAX_SUBMISSIONS
+    )
+
+class SubmissionBatchItemResult(BaseModel):
+    index: int
+    status: Literal["accepted", "rejected"]
+    id: Optional[UUID] = None
+    errors: Optional[Any] = None
+
+class SubmissionBatchResponse(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[SubmissionBatchItemResult]
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 from uuid import UUID
 from datetime import datetime
@@ -7,16 +7,39 @@ class WebsiteBase(BaseModel):
     domain: str = Field(..., min_length=4, max_length=255, description="Domain name (e.g. example.com)")
     name: Optional[str] = Field(None, max_length=100, description="Friendly name")
 
+def _normalize_origins(v: Optional[List[str]]) -> Optional[List[str]]:
+    if v is None:
+        return v
+    return [o.lower().strip() for o in v if o and o.strip()]
+
 class WebsiteCreate(WebsiteBase):
+    allowed_origins: List[str] = Field(default_factory=list, max_length=100, description="Extra hosts, *.wildcards or origins allowed to embed forms")
+
+    @field_validator('allowed_origins')
+    @classmethod
+    def validate_allowed_origins(cls, v: List[str]) -> List[str]:
+        return _normalize_origins(v)
+
     @field_validator('domain')
     @classmethod
     def validate_domain(cls, v: str) -> str:
         return v.lower().strip()
 
+class WebsiteUpdate(BaseModel):
+    name: Optional[str] = Field(None, max_length=100, description="Friendly name")
+    is_active: Optional[bool] = None
+    allowed_origins: Optional[List[str]] = Field(None, max_length=100, description="Extra hosts, *.wildcards or origins allowed to embed forms")
+
+    @field_validator('allowed_origins')
+    @classmethod
+    def validate_allowed_origins(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        return _normalize_origins(v)
+
 class WebsiteResponse(WebsiteBase):
     id: UUID
     tracking_id: str
     is_active: bool
+    allowed_origins: List[str] = []
     created_at: datetime
     tenant_id: UUID
 
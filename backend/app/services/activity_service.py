@@ -6,6 +6,23 @@ from fastapi import HTTPException
 from app.models.activity import Activity
 from app.models.contact import Contact
 from app.schemas.crm import ActivityCreate, ActivityUpdate
+from app.core.events import dispatcher
+from app.core.filters import FilterField, FilterSpec, ListQuery
+from app.core.pagination import Page, paginate
+
+# GET /activities filters, e.g. ?type=call,meeting&created_at>=2024-01-01
+ACTIVITY_FILTERS = FilterSpec(
+    Activity,
+    filters={
+        "type": FilterField(Activity.type, "enum", ActivityType),
+        "contact_id": FilterField(Activity.contact_id, "uuid"),
+        "created_at": FilterField(Activity.created_at, "datetime"),
+    },
+    sorts=["created_at"],
+)
+
+def _event(activity: Activity) -> dict:
+    return {"tenant_id": str(activity.tenant_id), "contact_id": str(activity.contact_id), "id": str(activity.id)}
 
 class ActivityService:
     @staticmethod
@@ -27,17 +44,30 @@ class ActivityService:
         db.add(activity)
         await db.commit()
         await db.refresh(activity)
+        await dispatcher.dispatch("activity.created", _event(activity))
         return activity
 
+    @staticmethod
+    async def get_all(
+        db: AsyncSession,
+        tenant_id: str,
+        query: Optional[ListQuery] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Page:
+        query = query or ACTIVITY_FILTERS.parse("")
+        stmt = select(Activity).where(Activity.tenant_id == tenant_id, *query.conditions)
+        return await paginate(db, stmt, query.sort_col, Activity.id, cursor, limit, query.descending)
+
     @staticmethod
     async def get_by_contact(
         db: AsyncSession, 
         tenant_id: str, 
         contact_id: str, 
-        skip: int = 0, 
+        cursor: Optional[str] = None,
         limit: int = 50,
         type_: Optional[ActivityType] = None
-    ) -> List[Activity]:
+    ) -> Page:
         stmt = select(Activity).where(
             Activity.contact_id == contact_id,
             Activity.tenant_id == tenant_id
@@ -46,10 +76,8 @@ class ActivityService:
         if type_:
             stmt = stmt.where(Activity.type == type_)
             
-        stmt = stmt.order_by(Activity.created_at.desc()).offset(skip).limit(limit)
-        
-        result = await db.execute(stmt)
-        return result.scalars().all()
+        # Newest first, keyset-paginated on ix_activity_contact_created
+        return await paginate(db, stmt, Activity.created_at, Activity.id, cursor, limit)
 
     @staticmethod
     async def update(db: AsyncSession, tenant_id: str, activity_id: str, data: ActivityUpdate) -> Activity:
@@ -65,6 +93,7 @@ class ActivityService:
         db.add(activity)
         await db.commit()
         await db.refresh(activity)
+        await dispatcher.dispatch("activity.updated", _event(activity))
         return activity
 
     @staticmethod
@@ -73,5 +102,7 @@ class ActivityService:
         activity = (await db.execute(stmt)).scalar_one_or_none()
         if not activity:
             raise HTTPException(status_code=404, detail="Activity not found")
+        payload = _event(activity)
         await db.delete(activity)
         await db.commit()
+        await dispatcher.dispatch("activity.deleted", payload)
@@ -0,0 +1,66 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core import security
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.api_key import ApiKey
+from app.models.tenant import Tenant
+from app.schemas.api_key import ApiKeyPrincipal
+
+# Marker for hashes known not to match a usable key (negative caching)
+_UNKNOWN = object()
+
+# Keyed by key_hash, never by the key itself
+_keys = TTLCache(maxsize=settings.API_KEY_CACHE_MAX_ENTRIES, ttl=settings.API_KEY_CACHE_TTL_SECONDS)
+
+_TOPIC = "api_key.changed"
+
+class ApiKeyDirectory:
+    """
+    API key -> ApiKeyPrincipal for machine clients. Keys are random, so an
+    HMAC (microseconds) identifies them instead of bcrypt, and a hit needs
+    no query. Revoked keys, keys of inactive tenants and unknown keys
+    resolve to None; unknown ones are cached briefly as well, so guessing
+    floods do not reach Postgres.
+    """
+
+    @staticmethod
+    async def resolve(db: AsyncSession, key: str) -> Optional[ApiKeyPrincipal]:
+        key_hash = security.hash_api_key(key)
+        cached = _keys.get(key_hash)
+        if cached is _UNKNOWN:
+            return None
+        if cached is not None:
+            return cached
+
+        stmt = select(ApiKey).join(Tenant, Tenant.id == ApiKey.tenant_id).where(
+            ApiKey.key_hash == key_hash,
+            ApiKey.revoked_at.is_(None),
+            Tenant.is_active.is_(True)
+        )
+        api_key = (await db.execute(stmt)).scalar_one_or_none()
+        if not api_key:
+            _keys.set(key_hash, _UNKNOWN, ttl=settings.API_KEY_CACHE_NEGATIVE_TTL_SECONDS)
+            return None
+
+        principal = ApiKeyPrincipal.model_validate(api_key)
+        _keys.set(key_hash, principal)
+        return principal
+
+    @staticmethod
+    async def invalidate(key_hash: str):
+        """
+        Call after a key is revoked (or its scopes / rate limit change).
+        """
+        await broadcaster.publish(_TOPIC, {"key_hash": key_hash})
+
+    @staticmethod
+    def clear():
+        _keys.clear()
+
+def _on_api_key_changed(payload: dict):
+    _keys.pop(payload["key_hash"])
+
+broadcaster.subscribe(_TOPIC, _on_api_key_changed)
@@ -2,15 +2,125 @@ from typing import List, Optional
 from fastapi import BackgroundTasks, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
-from app.models.contact import Contact
+from sqlalchemy import JSON, Float, String, cast, func, literal, literal_column, or_, true, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.models.contact import Contact, ContactStatus
 from app.models.deal import Deal
 from app.models.activity import Activity
 from app.schemas.crm import ContactCreate, ContactUpdate, ContactSummary
 from app.services.audit_service import AuditService
+from app.services.stats_service import StatsService
+from app.services.rollup_service import RollupService
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import dispatcher
+from app.core.filters import FilterField, FilterSpec, ListQuery
+from app.core.pagination import MAX_PAGE_SIZE, Page, pack_cursor, paginate, unpack_cursor
 from app.models.website import Website
+import re
 import uuid
 
+# GET /contacts filters, e.g. ?status=new,contacted&created_at>=2024-01-01&sort=-updated_at
+CONTACT_FILTERS = FilterSpec(
+    Contact,
+    filters={
+        "status": FilterField(Contact.status, "enum", ContactStatus),
+        "email": FilterField(Contact.email, "str"),
+        "website_id": FilterField(Contact.website_id, "uuid"),
+        "created_at": FilterField(Contact.created_at, "datetime"),
+        "updated_at": FilterField(Contact.updated_at, "datetime"),
+    },
+    sorts=["created_at", "updated_at", "name"],
+)
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# Keyed by (tenant_id, contact_id); dropped on contact/deal/activity writes (see bottom)
+_summaries = TTLCache(
+    maxsize=settings.CONTACT_SUMMARY_CACHE_MAX_ENTRIES,
+    ttl=settings.CONTACT_SUMMARY_CACHE_TTL_SECONDS
+)
+
+_SUMMARY_TOPIC = "contact_summary.changed"
+
+def _enum_text(column):
+    # Enum columns store member names ("NEW"); API values are their lowercase form
+    return func.lower(cast(column, String))
+
+def _summary_statement(tenant_id: str, contact_id: str):
+    """
+    SELECT contact json, deals json + pipeline sum, recent activities json, activity count
+    FROM contact LEFT JOIN LATERAL (...) deals, (...) recent, (...) counts
+    """
+    deals = select(
+        func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                "id", Deal.id,
+                "tenant_id", Deal.tenant_id,
+                "contact_id", Deal.contact_id,
+                "title", Deal.title,
+                "value", func.coalesce(Deal.value, 0),
+                "stage", _enum_text(Deal.stage),
+                "created_at", Deal.created_at,
+            ),
+            Deal.created_at.desc()
+        ), type_=JSON).label("deals"),
+        func.sum(Deal.value).label("total_pipeline_value")
+    ).where(
+        Deal.contact_id == Contact.id,
+        Deal.tenant_id == Contact.tenant_id
+    ).lateral("deals")
+
+    # LIMIT before aggregating: only the 5 newest rows are read (ix_activity_contact_created)
+    latest = select(Activity).where(
+        Activity.contact_id == Contact.id,
+        Activity.tenant_id == Contact.tenant_id
+    ).order_by(Activity.created_at.desc()).limit(5).correlate(Contact).subquery("latest")
+    recent = select(
+        func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                "id", latest.c.id,
+                "tenant_id", latest.c.tenant_id,
+                "contact_id", latest.c.contact_id,
+                "user_id", latest.c.user_id,
+                "type", _enum_text(latest.c.type),
+                "content", latest.c.content,
+                "created_at", latest.c.created_at,
+            ),
+            latest.c.created_at.desc()
+        ), type_=JSON).label("recent_activities")
+    ).select_from(latest).lateral("recent")
+
+    counts = select(func.count().label("activity_count")).where(
+        Activity.contact_id == Contact.id,
+        Activity.tenant_id == Contact.tenant_id
+    ).lateral("counts")
+
+    contact = func.json_build_object(
+        "id", Contact.id,
+        "tenant_id", Contact.tenant_id,
+        "name", Contact.name,
+        "email", Contact.email,
+        "phone", Contact.phone,
+        "source", Contact.source,
+        "status", _enum_text(Contact.status),
+        "created_at", Contact.created_at,
+        type_=JSON
+    ).label("contact")
+
+    return select(
+        contact,
+        deals.c.deals,
+        deals.c.total_pipeline_value,
+        recent.c.recent_activities,
+        counts.c.activity_count
+    ).select_from(Contact).outerjoin(deals, true()).outerjoin(recent, true()).outerjoin(counts, true()).where(
+        Contact.id == contact_id,
+        Contact.tenant_id == tenant_id
+    )
+
 class ContactService:
     @staticmethod
     async def get(db: AsyncSession, tenant_id: str, contact_id: str) -> Optional[Contact]:
@@ -22,12 +132,70 @@ class ContactService:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_all(db: AsyncSession, tenant_id: str, skip: int = 0, limit: int = 100) -> List[Contact]:
-        stmt = select(Contact).where(
-            Contact.tenant_id == tenant_id
-        ).offset(skip).limit(limit)
-        result = await db.execute(stmt)
-        return result.scalars().all()
+    async def get_all(
+        db: AsyncSession,
+        tenant_id: str,
+        query: Optional[ListQuery] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Page:
+        """
+        Newest first unless `query` sorts otherwise; keyset-paginated on (sort, id).
+        """
+        query = query or CONTACT_FILTERS.parse("")
+        stmt = select(Contact).where(Contact.tenant_id == tenant_id, *query.conditions)
+        return await paginate(db, stmt, query.sort_col, Contact.id, cursor, limit, query.descending)
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        tenant_id: str,
+        query: str,
+        cursor: Optional[str] = None,
+        limit: int = 25
+    ) -> Page:
+        """
+        Ranked search over name, email, phone and source.
+
+        A contact matches on a full-text prefix hit (`search_vector`) or a
+        trigram substring / fuzzy hit (`search_text`); both predicates are
+        served by the tenant-leading GIN indexes. Results are ordered by
+        max(ts_rank, word_similarity) and keyset-paginated on (score, id).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        needle = query.strip().lower()
+        terms = re.findall(r"\w+", needle)
+
+        matches = [
+            Contact.search_text.ilike(f"%{_escape_like(needle)}%", escape="\\"),
+            literal(needle).op("<%")(Contact.search_text),  # word similarity (typos)
+        ]
+        score = func.word_similarity(needle, Contact.search_text)
+        if terms:
+            tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{t}:*" for t in terms))
+            matches.append(Contact.search_vector.op("@@")(tsquery))
+            score = func.greatest(func.ts_rank(Contact.search_vector, tsquery), score)
+        score = cast(score, Float).label("score")
+
+        stmt = select(Contact, score).where(
+            Contact.tenant_id == tenant_id,
+            or_(*matches)
+        )
+        if cursor:
+            last_score, last_id = unpack_cursor(cursor, 2)
+            try:
+                bound = (float(last_score), uuid.UUID(last_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            stmt = stmt.where(tuple_(score.element, Contact.id) < bound)
+        stmt = stmt.order_by(score.desc(), Contact.id.desc()).limit(limit + 1)
+
+        rows = (await db.execute(stmt)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = pack_cursor([rows[-1].score, str(rows[-1].Contact.id)])
+        return Page([row.Contact for row in rows], next_cursor, None)
 
     @staticmethod
     async def create(
@@ -76,8 +244,12 @@ class ContactService:
             website_id=website_id
         )
         db.add(contact)
+        await db.flush()
+        await StatsService.apply(db, tenant_id, {"contact_count": 1})
+        await RollupService.record(db, tenant_id, RollupService.contact_increments(contact.created_at))
         await db.commit()
         await db.refresh(contact)
+        await dispatcher.dispatch("contact.created", {"tenant_id": str(tenant_id), "contact_id": str(contact.id)})
         
         if background_tasks:
             # Async Audit Log
@@ -106,45 +278,46 @@ class ContactService:
         db.add(contact)
         await db.commit()
         await db.refresh(contact)
+        await dispatcher.dispatch("contact.updated", {"tenant_id": str(tenant_id), "contact_id": str(contact.id)})
         return contact
 
     @staticmethod
     async def get_summary(db: AsyncSession, tenant_id: str, contact_id: str) -> ContactSummary:
-        # 1. Get Contact
-        contact = await ContactService.get(db, tenant_id, contact_id)
-        if not contact:
+        """
+        Contact, deals, pipeline value, the 5 latest activities and the activity
+        count in one round trip (LATERAL joins + json aggregates), cached per
+        contact until a contact/deal/activity write invalidates it.
+        """
+        try:
+            contact_id = uuid.UUID(str(contact_id))
+        except ValueError:
             raise HTTPException(status_code=404, detail="Contact not found")
-            
-        # 2. Get Recent Activities (Limit 5)
-        stmt_act = select(Activity).where(
-            Activity.contact_id == contact_id,
-            Activity.tenant_id == tenant_id
-        ).order_by(Activity.created_at.desc()).limit(5)
-        activities = (await db.execute(stmt_act)).scalars().all()
-        
-        # 3. Get Active Deals & Pipeline Value
-        stmt_deals = select(Deal).where(
-            Deal.contact_id == contact_id,
-            Deal.tenant_id == tenant_id
-        )
-        deals = (await db.execute(stmt_deals)).scalars().all()
-        
-        # 4. Aggregates (Count activities)
-        stmt_count = select(func.count(Activity.id)).where(
-            Activity.contact_id == contact_id,
-            Activity.tenant_id == tenant_id
-        )
-        act_count = (await db.execute(stmt_count)).scalar() or 0
-        
-        pipeline_value = sum(d.value for d in deals)
-        
-        return {
-            "contact": contact,
-            "deals": deals,
-            "recent_activities": activities,
-            "activity_count": act_count,
-            "total_pipeline_value": float(pipeline_value)
-        }
+
+        key = (str(tenant_id), str(contact_id))
+        cached = _summaries.get(key)
+        if cached is not None:
+            return cached
+
+        row = (await db.execute(_summary_statement(tenant_id, contact_id))).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Contact not found")
+
+        summary = ContactSummary.model_validate({
+            "contact": row.contact,
+            "deals": row.deals or [],
+            "recent_activities": row.recent_activities or [],
+            "activity_count": row.activity_count or 0,
+            "total_pipeline_value": float(row.total_pipeline_value or 0),
+        })
+        _summaries.set(key, summary)
+        return summary
+
+    @staticmethod
+    async def invalidate_summary(tenant_id: str, contact_id: str):
+        """
+        Drops the cached summary on every worker.
+        """
+        await broadcaster.publish(_SUMMARY_TOPIC, {"tenant_id": str(tenant_id), "contact_id": str(contact_id)})
 
     @staticmethod
     async def delete(db: AsyncSession, tenant_id: str, contact_id: str):
@@ -152,4 +325,24 @@ class ContactService:
         if not contact:
             raise HTTPException(status_code=404, detail="Contact not found")
         await db.delete(contact)
+        await StatsService.apply(db, tenant_id, {"contact_count": -1})
+        await RollupService.record(db, tenant_id, RollupService.contact_increments(contact.created_at, -1))
         await db.commit()
+        await dispatcher.dispatch("contact.deleted", {"tenant_id": str(tenant_id), "contact_id": str(contact_id)})
+
+def _on_summary_changed(payload: dict):
+    _summaries.pop((payload["tenant_id"], payload["contact_id"]))
+
+broadcaster.subscribe(_SUMMARY_TOPIC, _on_summary_changed)
+
+async def _on_contact_write(payload: dict):
+    if payload.get("contact_id"):
+        await ContactService.invalidate_summary(payload["tenant_id"], payload["contact_id"])
+
+for _event_name in (
+    "contact.updated", "contact.deleted",
+    "deal.created", "deal.updated", "deal.deleted",
+    "activity.created", "activity.updated", "activity.deleted",
+    "submission.created",
+):
+    dispatcher.subscribe(_event_name, _on_contact_write)
@@ -1,63 +1,195 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import func
-from app.models.contact import Contact
-from app.models.deal import Deal, DealStage
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import dispatcher
+from app.core.metrics import metrics
+from app.models.deal import DealStage
+from app.models.rollup import RollupMetric
+from app.schemas.dashboard import TrendInterval, TrendPoint
+from app.services.rollup_service import RollupService
+from app.services.stats_service import STAGE_COLUMNS, StatsService
+
+# Stages that still count towards the open pipeline
+ACTIVE_STAGES = [stage for stage in DealStage if stage not in (DealStage.WON, DealStage.LOST)]
+
+# Range shown when the client gives no `start`
+DEFAULT_TREND_SPANS = {
+    TrendInterval.HOUR: timedelta(days=2),
+    TrendInterval.DAY: timedelta(days=30),
+    TrendInterval.WEEK: timedelta(weeks=26),
+    TrendInterval.MONTH: timedelta(days=365),
+}
+
+# (tenant_id, generation, endpoint, params) -> response.
+# Bumping a tenant's generation on writes orphans all of its entries in O(1);
+# they age out through LRU / TTL.
+_responses = TTLCache(
+    maxsize=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
+_generations: Dict[str, int] = {}
+
+_TOPIC = "dashboard.changed"
+
+async def _cached(tenant_id: str, endpoint: str, params: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+    tenant_id = str(tenant_id)
+    key = (tenant_id, _generations.get(tenant_id, 0), endpoint, params)
+    value = _responses.get(key)
+    if value is not None:
+        metrics.incr("dashboard_cache.hit", endpoint=endpoint)
+        return value
+    metrics.incr("dashboard_cache.miss", endpoint=endpoint)
+    # Keyed by the generation read *before* computing: a write that lands
+    # meanwhile bumps it, so a possibly stale result is never served
+    value = await compute()
+    _responses.set(key, value)
+    return value
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 class DashboardService:
+    """
+    Totals read the incrementally maintained TenantStats row and trends read
+    the daily / hourly rollups: cost depends on the chart range, never on
+    how many contacts, deals or submissions the tenant has.
+    """
+
+    @staticmethod
+    async def invalidate(tenant_id: str):
+        """
+        Drops the tenant's cached responses on every worker.
+        """
+        await broadcaster.publish(_TOPIC, {"tenant_id": str(tenant_id)})
+
     @staticmethod
     async def get_overview_stats(db: AsyncSession, tenant_id: str):
-        # 1. Total Contacts
-        stmt_contacts = select(func.count(Contact.id)).where(Contact.tenant_id == tenant_id)
-        result_contacts = await db.execute(stmt_contacts)
-        total_contacts = result_contacts.scalar() or 0
-
-        # 2. Active Deals (Not Won or Lost)
-        stmt_active_deals = select(func.count(Deal.id)).where(
-            Deal.tenant_id == tenant_id,
-            Deal.stage.notin_([DealStage.WON, DealStage.LOST])
-        )
-        result_active = await db.execute(stmt_active_deals)
-        active_deals = result_active.scalar() or 0
-
-        # 3. Pipeline Value (Sum of Active Deals)
-        stmt_value = select(func.sum(Deal.value)).where(
-            Deal.tenant_id == tenant_id,
-            Deal.stage.notin_([DealStage.WON, DealStage.LOST])
-        )
-        result_value = await db.execute(stmt_value)
-        pipeline_value = result_value.scalar() or 0
-
-        # 4. Won vs Lost
-        stmt_won = select(func.count(Deal.id)).where(Deal.tenant_id == tenant_id, Deal.stage == DealStage.WON)
-        result_won = await db.execute(stmt_won)
-        won_count = result_won.scalar() or 0
-
-        stmt_lost = select(func.count(Deal.id)).where(Deal.tenant_id == tenant_id, Deal.stage == DealStage.LOST)
-        result_lost = await db.execute(stmt_lost)
-        lost_count = result_lost.scalar() or 0
+        return await _cached(tenant_id, "overview", None, lambda: DashboardService._overview(db, tenant_id))
+
+    @staticmethod
+    async def get_pipeline_breakdown(db: AsyncSession, tenant_id: str):
+        return await _cached(tenant_id, "pipeline", None, lambda: DashboardService._pipeline(db, tenant_id))
+
+    @staticmethod
+    async def _overview(db: AsyncSession, tenant_id: str):
+        stats = await StatsService.get(db, tenant_id)
+
+        active_deals = sum(getattr(stats, STAGE_COLUMNS[stage][0]) for stage in ACTIVE_STAGES)
+        pipeline_value = sum(getattr(stats, STAGE_COLUMNS[stage][1]) for stage in ACTIVE_STAGES)
 
         return {
-            "total_contacts": total_contacts,
+            "total_contacts": stats.contact_count,
             "active_deals": active_deals,
             "pipeline_value": float(pipeline_value) if pipeline_value else 0.0,
-            "won_count": won_count,
-            "lost_count": lost_count
+            "won_count": stats.won_count,
+            "lost_count": stats.lost_count
         }
 
     @staticmethod
-    async def get_pipeline_breakdown(db: AsyncSession, tenant_id: str):
-        # Group by Stage
-        stmt = select(Deal.stage, func.count(Deal.id)).where(
-            Deal.tenant_id == tenant_id
-        ).group_by(Deal.stage)
-        
-        result = await db.execute(stmt)
-        data = result.all()
-        
-        # Convert to dictionary with defaults
-        breakdown = {stage.value: 0 for stage in DealStage}
-        for stage, count in data:
-            breakdown[stage.value] = count
-            
-        return breakdown
+    async def _pipeline(db: AsyncSession, tenant_id: str):
+        stats = await StatsService.get(db, tenant_id)
+        return {stage.value: getattr(stats, STAGE_COLUMNS[stage][0]) for stage in DealStage}
+
+    @staticmethod
+    def _trend_range(
+        interval: TrendInterval, start: Optional[datetime], end: Optional[datetime]
+    ) -> Tuple[datetime, datetime]:
+        end = _naive_utc(end) if end else datetime.utcnow()
+        start = _naive_utc(start) if start else end - DEFAULT_TREND_SPANS[interval]
+        if start > end:
+            raise HTTPException(status_code=400, detail="start must be before end")
+
+        if interval == TrendInterval.HOUR:
+            max_span = timedelta(days=settings.ROLLUP_HOURLY_RETENTION_DAYS)
+            if start < datetime.utcnow() - max_span:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Hourly trends cover the last {settings.ROLLUP_HOURLY_RETENTION_DAYS} days"
+                )
+        else:
+            max_span = timedelta(days=settings.ROLLUP_MAX_RANGE_DAYS)
+        if end - start > max_span:
+            raise HTTPException(status_code=400, detail=f"Range is limited to {max_span.days} days for '{interval.value}'")
+        return start, end
+
+    # Trends are cached on the parameters as sent: with `end` omitted
+    # ("until now") the key stays stable and the current bucket is refreshed
+    # by the next write or after the TTL.
+
+    @staticmethod
+    async def get_contact_trend(
+        db: AsyncSession, tenant_id: str, interval: TrendInterval,
+        start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[TrendPoint]:
+        async def compute():
+            range_start, range_end = DashboardService._trend_range(interval, start, end)
+            series = await RollupService.series(
+                db, tenant_id, RollupMetric.CONTACTS_CREATED, interval, range_start, range_end, dimension=""
+            )
+            return series[""]
+        return await _cached(tenant_id, "trends.contacts", (interval, start, end), compute)
+
+    @staticmethod
+    async def get_submission_trend(
+        db: AsyncSession, tenant_id: str, interval: TrendInterval,
+        start: Optional[datetime] = None, end: Optional[datetime] = None, form_id: Optional[str] = None
+    ) -> Dict[str, List[TrendPoint]]:
+        dimension = str(form_id) if form_id else None
+
+        async def compute():
+            range_start, range_end = DashboardService._trend_range(interval, start, end)
+            return await RollupService.series(
+                db, tenant_id, RollupMetric.SUBMISSIONS, interval, range_start, range_end, dimension=dimension
+            )
+        return await _cached(tenant_id, "trends.submissions", (interval, start, end, dimension), compute)
+
+    @staticmethod
+    async def get_deal_trend(
+        db: AsyncSession, tenant_id: str, interval: TrendInterval,
+        start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Dict[str, List[TrendPoint]]:
+        async def compute():
+            range_start, range_end = DashboardService._trend_range(interval, start, end)
+            result = {}
+            for stage, metric in ((DealStage.WON, RollupMetric.DEALS_WON), (DealStage.LOST, RollupMetric.DEALS_LOST)):
+                series = await RollupService.series(db, tenant_id, metric, interval, range_start, range_end, dimension="")
+                result[stage.value] = series[""]
+            return result
+        return await _cached(tenant_id, "trends.deals", (interval, start, end), compute)
+
+    @staticmethod
+    async def get_pipeline_trend(
+        db: AsyncSession, tenant_id: str, interval: TrendInterval,
+        start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[TrendPoint]:
+        async def compute():
+            range_start, range_end = DashboardService._trend_range(interval, start, end)
+            series = await RollupService.series(
+                db, tenant_id, RollupMetric.PIPELINE, interval, range_start, range_end, dimension="", cumulative=True
+            )
+            return series[""]
+        return await _cached(tenant_id, "trends.pipeline", (interval, start, end), compute)
+
+def _on_dashboard_changed(payload: dict):
+    tenant_id = payload["tenant_id"]
+    _generations[tenant_id] = _generations.get(tenant_id, 0) + 1
+
+broadcaster.subscribe(_TOPIC, _on_dashboard_changed)
+
+async def _on_dashboard_write(payload: dict):
+    await DashboardService.invalidate(payload["tenant_id"])
+
+# Every write that changes a counter or a rollup. contact.updated is left
+# out on purpose: no dashboard number depends on contact fields.
+for _event_name in (
+    "contact.created", "contact.deleted",
+    "deal.created", "deal.updated", "deal.deleted",
+    "submission.created",
+):
+    dispatcher.subscribe(_event_name, _on_dashboard_write)
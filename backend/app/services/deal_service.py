@@ -1,10 +1,53 @@
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
-from app.models.deal import Deal
+from app.models.deal import CLOSED_STAGES, Deal
 from app.models.contact import Contact
 from app.schemas.crm import DealCreate, DealUpdate, DealStage
+from app.core.events import dispatcher
+from app.services.stats_service import StatsService
+from app.services.rollup_service import RollupService
+from app.core.filters import FilterField, FilterSpec, ListQuery
+from app.core.pagination import MAX_PAGE_SIZE, Page, paginate
+
+# GET /deals filters, e.g. ?stage=proposal&value>=1000&sort=-updated_at
+# (value is nullable, so it cannot be a keyset sort key)
+DEAL_FILTERS = FilterSpec(
+    Deal,
+    filters={
+        "stage": FilterField(Deal.stage, "enum", DealStage),
+        "contact_id": FilterField(Deal.contact_id, "uuid"),
+        "value": FilterField(Deal.value, "number"),
+        "created_at": FilterField(Deal.created_at, "datetime"),
+        "updated_at": FilterField(Deal.updated_at, "datetime"),
+    },
+    sorts=["created_at", "updated_at"],
+)
+
+def _event(deal: Deal) -> dict:
+    return {"tenant_id": str(deal.tenant_id), "contact_id": str(deal.contact_id), "id": str(deal.id)}
+
+def _rollup_state(deal: Deal):
+    return (deal.stage, deal.value, deal.created_at, deal.closed_at)
+
+def _track_close(deal: Deal, previous_stage: Optional[DealStage]):
+    """
+    Stamps closed_at when a deal enters won / lost, clears it when it reopens.
+    """
+    if deal.stage not in CLOSED_STAGES:
+        deal.closed_at = None
+    elif deal.stage != previous_stage or deal.closed_at is None:
+        deal.closed_at = datetime.utcnow()
+
+async def _apply_counters(db: AsyncSession, tenant_id: str, before: Optional[tuple], after: Optional[tuple]):
+    """
+    Stats and rollup deltas for a deal write. `before` / `after` are
+    `_rollup_state` snapshots, None when the deal does not exist.
+    """
+    await StatsService.apply(db, tenant_id, StatsService.deal_delta(before and before[:2], after and after[:2]))
+    await RollupService.record(db, tenant_id, RollupService.deal_delta(before, after))
 
 class DealService:
     @staticmethod
@@ -23,58 +66,83 @@ class DealService:
             **data.model_dump(),
             tenant_id=tenant_id
         )
+        _track_close(deal, None)
         db.add(deal)
+        await db.flush()
+        await _apply_counters(db, tenant_id, None, _rollup_state(deal))
         await db.commit()
         await db.refresh(deal)
+        await dispatcher.dispatch("deal.created", _event(deal))
         return deal
 
     @staticmethod
-    async def get_all(db: AsyncSession, tenant_id: str) -> List[Deal]:
-        stmt = select(Deal).where(Deal.tenant_id == tenant_id)
-        result = await db.execute(stmt)
-        return result.scalars().all()
+    async def get_all(
+        db: AsyncSession,
+        tenant_id: str,
+        query: Optional[ListQuery] = None,
+        cursor: Optional[str] = None,
+        limit: int = MAX_PAGE_SIZE
+    ) -> Page:
+        """
+        Newest first unless `query` sorts otherwise; keyset-paginated on (sort, id).
+        """
+        query = query or DEAL_FILTERS.parse("")
+        stmt = select(Deal).where(Deal.tenant_id == tenant_id, *query.conditions)
+        return await paginate(db, stmt, query.sort_col, Deal.id, cursor, limit, query.descending)
 
     @staticmethod
     async def update_stage(db: AsyncSession, tenant_id: str, deal_id: str, stage: DealStage) -> Deal:
+        # Row lock: the stats delta is computed from the stage we read
         stmt = select(Deal).where(
             Deal.id == deal_id,
             Deal.tenant_id == tenant_id
-        )
+        ).with_for_update()
         result = await db.execute(stmt)
         deal = result.scalar_one_or_none()
         
         if not deal:
             raise HTTPException(status_code=404, detail="Deal not found")
             
+        before = _rollup_state(deal)
         deal.stage = stage
+        _track_close(deal, before[0])
+        await _apply_counters(db, tenant_id, before, _rollup_state(deal))
         await db.commit()
         await db.refresh(deal)
+        await dispatcher.dispatch("deal.updated", _event(deal))
         return deal
 
     @staticmethod
     async def update(db: AsyncSession, tenant_id: str, deal_id: str, data: DealUpdate) -> Deal:
-        stmt = select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id)
+        stmt = select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id).with_for_update()
         deal = (await db.execute(stmt)).scalar_one_or_none()
         
         if not deal:
             raise HTTPException(status_code=404, detail="Deal not found")
             
+        before = _rollup_state(deal)
         update_data = data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(deal, key, value)
+        _track_close(deal, before[0])
             
         db.add(deal)
+        await _apply_counters(db, tenant_id, before, _rollup_state(deal))
         await db.commit()
         await db.refresh(deal)
+        await dispatcher.dispatch("deal.updated", _event(deal))
         return deal
 
     @staticmethod
     async def delete(db: AsyncSession, tenant_id: str, deal_id: str):
-        stmt = select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id)
+        stmt = select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id).with_for_update()
         deal = (await db.execute(stmt)).scalar_one_or_none()
         
         if not deal:
             raise HTTPException(status_code=404, detail="Deal not found")
-            
+
+        payload = _event(deal)
         await db.delete(deal)
+        await _apply_counters(db, tenant_id, _rollup_state(deal), None)
         await db.commit()
+        await dispatcher.dispatch("deal.deleted", payload)
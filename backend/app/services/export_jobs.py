@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.models.export_job import ExportJob, ExportJobStatus
+from app.models.form import Form
+from app.schemas.auth import UserPrincipal
+from app.models.website import Website
+from app.schemas.export import ExportFormat, ExportJobCreate, ExportKind
+from app.services.export_service import ExportDataset, ExportService
+
+logger = logging.getLogger("api")
+
+async def build_dataset(db: AsyncSession, kind: ExportKind, tenant_id, form_id=None) -> Optional[ExportDataset]:
+    """
+    Returns None when the form does not exist in this tenant.
+    """
+    if kind == ExportKind.CONTACTS:
+        return ExportService.contacts(tenant_id)
+    if kind == ExportKind.DEALS:
+        return ExportService.deals(tenant_id)
+    if kind == ExportKind.ACTIVITIES:
+        return ExportService.activities(tenant_id)
+
+    stmt = select(Form).join(Website).options(selectinload(Form.fields)).where(
+        Form.id == form_id,
+        Website.tenant_id == tenant_id
+    )
+    form = (await db.execute(stmt)).scalar_one_or_none()
+    if not form:
+        return None
+    return ExportService.form_submissions(form.id, [field.key for field in form.fields])
+
+class ExportJobRunner:
+    """
+    Runs exports off the request path.
+
+    POST /exports records a job and queues its id; `workers` background tasks
+    stream the dataset to `<storage_dir>/<job_id>.<ext>` chunk by chunk and
+    mark the job completed. Clients poll the job and download the file
+    (Range requests are supported, so interrupted downloads resume).
+
+    A completed job is reused for new requests while the dataset fingerprint
+    (row count + last change) is unchanged and the file has not expired.
+    """
+
+    def __init__(self, workers: int, storage_dir: str, retention: timedelta, stale_after: timedelta):
+        self.workers = workers
+        self.storage_dir = storage_dir
+        self.retention = retention
+        self.stale_after = stale_after
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        if self._tasks:
+            return
+        os.makedirs(self.storage_dir, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        try:
+            await self._recover()
+            await self._purge_expired()
+        except Exception as e:
+            logger.error(f"Export job recovery failed: {e}")
+
+    async def stop(self):
+        """
+        Interrupted jobs go back to pending and are picked up on the next start.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, job_id: uuid.UUID):
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    async def create(self, db: AsyncSession, user: UserPrincipal, job_in: ExportJobCreate, dataset: ExportDataset) -> ExportJob:
+        """
+        Returns a reusable job for the same data, or records and queues a new one.
+        """
+        fingerprint = await ExportService.fingerprint(db, dataset, job_in.format)
+
+        stmt = select(ExportJob).where(
+            ExportJob.tenant_id == user.tenant_id,
+            ExportJob.dataset == job_in.dataset.value,
+            ExportJob.format == job_in.format.value,
+            ExportJob.fingerprint == fingerprint,
+            ExportJob.status != ExportJobStatus.FAILED,
+            ExportJob.created_at > datetime.utcnow() - self.retention
+        ).order_by(ExportJob.created_at.desc()).limit(1)
+        if job_in.form_id is not None:
+            stmt = stmt.where(ExportJob.form_id == job_in.form_id)
+        existing = (await db.execute(stmt)).scalar_one_or_none()
+        if existing and (existing.status != ExportJobStatus.COMPLETED or os.path.exists(existing.file_path)):
+            metrics.incr("export_jobs.reused")
+            return existing
+
+        job = ExportJob(
+            dataset=job_in.dataset.value,
+            format=job_in.format.value,
+            form_id=job_in.form_id,
+            fingerprint=fingerprint,
+            status=ExportJobStatus.PENDING,
+            tenant_id=user.tenant_id,
+            user_id=user.id
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+
+        metrics.incr("export_jobs.created")
+        self.enqueue(job.id)
+        return job
+
+    def path_for(self, job: ExportJob) -> str:
+        return os.path.join(self.storage_dir, f"{job.id}.{ExportService.extension(ExportFormat(job.format))}")
+
+    async def _run(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Export job {job_id} crashed: {e}")
+
+    async def _execute(self, job_id: uuid.UUID):
+        async with AsyncSessionLocal() as db:
+            # Claim atomically: another worker process may have queued the same id
+            claimed = await db.execute(
+                update(ExportJob)
+                .where(ExportJob.id == job_id, ExportJob.status == ExportJobStatus.PENDING)
+                .values(status=ExportJobStatus.RUNNING, started_at=datetime.utcnow())
+                .returning(ExportJob.id)
+            )
+            await db.commit()
+            if claimed.scalar_one_or_none() is None:
+                return
+
+            job = await db.get(ExportJob, job_id)
+            fmt = ExportFormat(job.format)
+            path = self.path_for(job)
+            partial = f"{path}.part"
+            try:
+                dataset = await build_dataset(db, ExportKind(job.dataset), job.tenant_id, job.form_id)
+                if dataset is None:
+                    raise ValueError("Form not found")
+                ExportService.check_format(fmt)
+                # Fingerprint the data actually written, not the data at request time
+                job.fingerprint = await ExportService.fingerprint(db, dataset, fmt)
+
+                size = 0
+                with open(partial, "wb") as fh:
+                    async for chunk in ExportService.stream(dataset, fmt):
+                        await asyncio.to_thread(fh.write, chunk)
+                        size += len(chunk)
+                os.replace(partial, path)
+            except asyncio.CancelledError:
+                self._discard(partial)
+                job.status = ExportJobStatus.PENDING
+                job.started_at = None
+                await asyncio.shield(db.commit())
+                raise
+            except Exception as e:
+                self._discard(partial)
+                logger.error(f"Export job {job_id} failed: {e}")
+                metrics.incr("export_jobs.failed")
+                job.status = ExportJobStatus.FAILED
+                job.error = getattr(e, "detail", None) or str(e)
+                job.completed_at = datetime.utcnow()
+                await db.commit()
+                return
+
+            job.status = ExportJobStatus.COMPLETED
+            job.file_path = path
+            job.size_bytes = size
+            job.completed_at = datetime.utcnow()
+            await db.commit()
+            metrics.incr("export_jobs.completed")
+
+        await self._purge_expired()
+
+    async def _recover(self):
+        """
+        Requeues pending jobs and jobs whose worker died mid-run.
+        """
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ExportJob)
+                .where(
+                    ExportJob.status == ExportJobStatus.RUNNING,
+                    ExportJob.started_at < datetime.utcnow() - self.stale_after
+                )
+                .values(status=ExportJobStatus.PENDING, started_at=None)
+            )
+            await db.commit()
+            stmt = select(ExportJob.id).where(ExportJob.status == ExportJobStatus.PENDING).order_by(ExportJob.created_at)
+            for job_id in (await db.execute(stmt)).scalars().all():
+                self.enqueue(job_id)
+
+    async def _purge_expired(self):
+        async with AsyncSessionLocal() as db:
+            stmt = select(ExportJob).where(
+                ExportJob.status.in_([ExportJobStatus.COMPLETED, ExportJobStatus.FAILED]),
+                ExportJob.created_at < datetime.utcnow() - self.retention
+            )
+            expired = (await db.execute(stmt)).scalars().all()
+            for job in expired:
+                if job.file_path:
+                    self._discard(job.file_path)
+                await db.delete(job)
+            await db.commit()
+
+    @staticmethod
+    def _discard(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+# Global Instance
+export_jobs = ExportJobRunner(
+    workers=settings.EXPORT_JOB_WORKERS,
+    storage_dir=settings.EXPORT_STORAGE_DIR,
+    retention=timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS),
+    stale_after=timedelta(minutes=settings.EXPORT_JOB_STALE_MINUTES),
+)
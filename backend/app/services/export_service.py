@@ -0,0 +1,345 @@
+import csv
+import enum
+import hashlib
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.activity import Activity
+from app.models.contact import Contact
+from app.models.deal import Deal
+from app.models.submission import FormSubmission
+from app.schemas.export import ExportFormat
+import uuid
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Optional: only needed for the columnar formats
+    pa = None
+
+# Column kinds: "str", "float", "datetime", "json" (arbitrary JSON value)
+Column = Tuple[str, str]
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: ("text/csv", "csv"),
+    ExportFormat.NDJSON: ("application/gzip", "ndjson.gz"),
+    ExportFormat.ARROW: ("application/vnd.apache.arrow.stream", "arrows"),
+    ExportFormat.PARQUET: ("application/vnd.apache.parquet", "parquet"),
+}
+
+class ExportDataset:
+    """
+    What to export: an ordered column list, the SELECT producing the rows,
+    and an optional function mapping a result row to column values.
+
+    `version_stmt` selects (row count, last change) for the same rows; export
+    jobs hash it to decide whether a finished file is still current.
+    `csv_headers` overrides the CSV header row (column names otherwise).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: List[Column],
+        stmt,
+        to_values: Optional[Callable[[Any], Sequence[Any]]] = None,
+        version_stmt=None,
+        csv_headers: Optional[List[str]] = None
+    ):
+        self.name = name
+        self.columns = columns
+        self.stmt = stmt
+        self.to_values = to_values or tuple
+        self.version_stmt = version_stmt
+        self.csv_headers = csv_headers or [name for name, _ in columns]
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(_scalar(value))
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return str(_scalar(value))
+
+class _Sink:
+    """
+    Write-only file object that hands back whatever was written since the last drain.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class ExportService:
+    """
+    Streaming exports. Rows are read through a server-side cursor
+    (`yield_per`) and encoded chunk by chunk, so memory stays flat
+    regardless of table size.
+
+    Each stream opens its own session: the request-scoped session is
+    closed before a StreamingResponse body is consumed.
+    """
+
+    # --- Datasets ---
+
+    @staticmethod
+    def form_submissions(form_id: uuid.UUID, field_keys: List[str]) -> ExportDataset:
+        """
+        Columns come from the form's FormField definitions (no pre-scan of the data).
+        Forms without declared fields export the payload as a single JSON "data" column.
+        The CSV keeps the original export's header labels.
+        """
+        keys = field_keys or ["data"]
+        columns = [("id", "str"), ("created_at", "datetime"), ("ip", "str")]
+        columns.extend((key, "json") for key in keys)
+        csv_headers = ["Submission ID", "Date", "IP Address"] + keys
+
+        stmt = select(
+            FormSubmission.id,
+            FormSubmission.created_at,
+            FormSubmission.meta,
+            FormSubmission.data
+        ).where(
+            FormSubmission.form_id == form_id
+        ).order_by(FormSubmission.created_at.desc())
+
+        def to_values(row):
+            sub_id, created_at, meta, data = row
+            data = data or {}
+            values = [sub_id, created_at, (meta or {}).get("ip")]
+            if field_keys:
+                values.extend(data.get(key) for key in field_keys)
+            else:
+                values.append(data)
+            return values
+
+        version_stmt = select(func.count(), func.max(FormSubmission.created_at)).where(
+            FormSubmission.form_id == form_id
+        )
+        return ExportDataset(f"form_export_{form_id}", columns, stmt, to_values, version_stmt, csv_headers)
+
+    @staticmethod
+    def contacts(tenant_id: str) -> ExportDataset:
+        stmt = select(
+            Contact.id, Contact.name, Contact.email, Contact.phone, Contact.source,
+            Contact.status, Contact.website_id, Contact.created_at, Contact.updated_at
+        ).where(Contact.tenant_id == tenant_id).order_by(Contact.created_at)
+        columns = [
+            ("id", "str"), ("name", "str"), ("email", "str"), ("phone", "str"), ("source", "str"),
+            ("status", "str"), ("website_id", "str"), ("created_at", "datetime"), ("updated_at", "datetime"),
+        ]
+        version_stmt = select(func.count(), func.max(Contact.updated_at)).where(Contact.tenant_id == tenant_id)
+        return ExportDataset("contacts_export", columns, stmt, version_stmt=version_stmt)
+
+    @staticmethod
+    def deals(tenant_id: str) -> ExportDataset:
+        stmt = select(
+            Deal.id, Deal.title, Deal.value, Deal.stage, Deal.contact_id, Deal.created_at, Deal.updated_at
+        ).where(Deal.tenant_id == tenant_id).order_by(Deal.created_at)
+        columns = [
+            ("id", "str"), ("title", "str"), ("value", "float"), ("stage", "str"),
+            ("contact_id", "str"), ("created_at", "datetime"), ("updated_at", "datetime"),
+        ]
+        version_stmt = select(func.count(), func.max(Deal.updated_at)).where(Deal.tenant_id == tenant_id)
+        return ExportDataset("deals_export", columns, stmt, version_stmt=version_stmt)
+
+    @staticmethod
+    def activities(tenant_id: str) -> ExportDataset:
+        stmt = select(
+            Activity.id, Activity.type, Activity.content, Activity.contact_id, Activity.user_id, Activity.created_at
+        ).where(Activity.tenant_id == tenant_id).order_by(Activity.created_at)
+        columns = [
+            ("id", "str"), ("type", "str"), ("content", "str"), ("contact_id", "str"),
+            ("user_id", "str"), ("created_at", "datetime"),
+        ]
+        version_stmt = select(func.count(), func.max(Activity.updated_at)).where(Activity.tenant_id == tenant_id)
+        return ExportDataset("activities_export", columns, stmt, version_stmt=version_stmt)
+
+    # --- Streaming ---
+
+    @staticmethod
+    def check_format(fmt: ExportFormat):
+        """
+        Call before starting a response: columnar formats need pyarrow.
+        """
+        if fmt in (ExportFormat.ARROW, ExportFormat.PARQUET) and pa is None:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail=f"Export format '{fmt.value}' requires pyarrow, which is not installed"
+            )
+
+    @staticmethod
+    def filename(dataset: ExportDataset, fmt: ExportFormat) -> str:
+        return f"{dataset.name}.{ExportService.extension(fmt)}"
+
+    @staticmethod
+    def media_type(fmt: ExportFormat) -> str:
+        return MEDIA_TYPES[fmt][0]
+
+    @staticmethod
+    def extension(fmt: ExportFormat) -> str:
+        return MEDIA_TYPES[fmt][1]
+
+    @staticmethod
+    async def fingerprint(db: AsyncSession, dataset: ExportDataset, fmt: ExportFormat) -> str:
+        """
+        Changes whenever rows are added, removed or updated (or the columns change):
+        every dataset's `version_stmt` reads a column bumped on update, except
+        form submissions, which are never updated.
+        """
+        count, last_change = (await db.execute(dataset.version_stmt)).one()
+        raw = json.dumps(
+            [
+                dataset.name, fmt.value, dataset.columns, dataset.csv_headers,
+                count, last_change.isoformat() if last_change else None
+            ]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def streaming_response(dataset: ExportDataset, fmt: ExportFormat) -> StreamingResponse:
+        ExportService.check_format(fmt)
+        return StreamingResponse(
+            ExportService.stream(dataset, fmt),
+            media_type=ExportService.media_type(fmt),
+            headers={"Content-Disposition": f"attachment; filename={ExportService.filename(dataset, fmt)}"}
+        )
+
+    @staticmethod
+    async def _stream_partitions(dataset: ExportDataset) -> AsyncIterator[List[Sequence[Any]]]:
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                dataset.stmt.execution_options(yield_per=settings.EXPORT_CHUNK_ROWS)
+            )
+            async for partition in result.partitions():
+                yield [dataset.to_values(row) for row in partition]
+
+    @staticmethod
+    def stream(dataset: ExportDataset, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        if fmt == ExportFormat.CSV:
+            return ExportService._encode_csv(dataset.csv_headers, ExportService._stream_partitions(dataset))
+        encoders = {
+            ExportFormat.NDJSON: ExportService._encode_ndjson_gzip,
+            ExportFormat.ARROW: ExportService._encode_arrow,
+            ExportFormat.PARQUET: ExportService._encode_parquet,
+        }
+        return encoders[fmt](dataset.columns, ExportService._stream_partitions(dataset))
+
+    # --- Encoders ---
+
+    @staticmethod
+    async def _encode_csv(headers: List[str], partitions) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        async for rows in partitions:
+            writer.writerows([_text(value) for value in values] for values in rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    async def _encode_ndjson_gzip(columns: List[Column], partitions) -> AsyncIterator[bytes]:
+        names = [name for name, _ in columns]
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        async for rows in partitions:
+            lines = "".join(
+                json.dumps({name: _scalar(value) for name, value in zip(names, values)}, default=_json_default) + "\n"
+                for values in rows
+            )
+            chunk = compressor.compress(lines.encode("utf-8"))
+            if chunk:
+                yield chunk
+        yield compressor.flush()
+
+    @staticmethod
+    def _arrow_schema(columns: List[Column]):
+        types = {"str": pa.string(), "float": pa.float64(), "datetime": pa.timestamp("us"), "json": pa.string()}
+        return pa.schema([(name, types[kind]) for name, kind in columns])
+
+    @staticmethod
+    def _arrow_batch(schema, columns: List[Column], rows: List[Sequence[Any]]):
+        arrays = []
+        for index, (_, kind) in enumerate(columns):
+            values = [values[index] for values in rows]
+            if kind == "float":
+                values = [None if v is None else float(v) for v in values]
+            elif kind == "json":
+                values = [None if v is None else (v if isinstance(v, str) else json.dumps(v, default=_json_default)) for v in values]
+            elif kind == "str":
+                values = [None if v is None else str(_scalar(v)) for v in values]
+            arrays.append(values)
+        return pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(arrays, schema)],
+            schema=schema
+        )
+
+    @staticmethod
+    async def _encode_arrow(columns: List[Column], partitions) -> AsyncIterator[bytes]:
+        schema = ExportService._arrow_schema(columns)
+        sink = _Sink()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            async for rows in partitions:
+                writer.write_batch(ExportService._arrow_batch(schema, columns, rows))
+                yield sink.drain()
+        yield sink.drain()
+
+    @staticmethod
+    async def _encode_parquet(columns: List[Column], partitions) -> AsyncIterator[bytes]:
+        schema = ExportService._arrow_schema(columns)
+        sink = _Sink()
+        # One row group per fetched partition; the footer is written on close
+        with pa.parquet.ParquetWriter(sink, schema, compression="snappy") as writer:
+            async for rows in partitions:
+                writer.write_batch(ExportService._arrow_batch(schema, columns, rows))
+                yield sink.drain()
+        yield sink.drain()
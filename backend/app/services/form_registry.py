@@ -0,0 +1,116 @@
+from functools import cached_property
+import hashlib
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.origins import OriginMatcher
+from app.models.form import Form
+from app.models.website import Website
+from app.schemas.form import FormResponse
+from app.schemas.website import WebsiteResponse
+from app.services.form_validation import CompiledFormValidator
+import uuid
+
+class WebsiteEntry:
+    """
+    Cached public view of a Website, resolved from its tracking_id.
+    """
+    def __init__(self, website: WebsiteResponse):
+        self.website = website
+        self.origin_matcher = OriginMatcher(
+            website.domain,
+            website.allowed_origins,
+            allow_localhost=settings.PUBLIC_ALLOW_LOCALHOST_ORIGINS
+        )
+
+class FormEntry:
+    """
+    Cached public view of a Form and its FormFields.
+    The JSON body and its strong ETag are computed once per entry, so any
+    change to the form (which invalidates the entry) yields a new ETag.
+    """
+    def __init__(self, form: FormResponse):
+        self.form = form
+        self.body = form.model_dump_json().encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    @cached_property
+    def validator(self) -> CompiledFormValidator:
+        # Compiled on first submission; dropped together with the entry on invalidation
+        return CompiledFormValidator(self.form)
+
+# Keyed by tracking_id
+_websites = TTLCache(maxsize=settings.PUBLIC_CACHE_MAX_ENTRIES, ttl=settings.PUBLIC_CACHE_TTL_SECONDS)
+# Keyed by (website_id, form_id)
+_forms = TTLCache(maxsize=settings.PUBLIC_CACHE_MAX_ENTRIES, ttl=settings.PUBLIC_CACHE_TTL_SECONDS)
+
+_WEBSITE_TOPIC = "website.changed"
+_FORM_TOPIC = "form.changed"
+
+class FormRegistry:
+    """
+    Resolves tracking IDs and forms for the public embed endpoints.
+    Hits are served from process memory; writes in websites.py / forms.py
+    must call the matching invalidate_* method, which is broadcast to all workers.
+    """
+
+    @staticmethod
+    async def get_website(db: AsyncSession, tracking_id: str) -> Optional[WebsiteEntry]:
+        entry = _websites.get(tracking_id)
+        if entry is not None:
+            return entry
+
+        stmt = select(Website).where(Website.tracking_id == tracking_id)
+        website = (await db.execute(stmt)).scalar_one_or_none()
+        if not website:
+            return None
+
+        entry = WebsiteEntry(WebsiteResponse.model_validate(website))
+        _websites.set(tracking_id, entry)
+        return entry
+
+    @staticmethod
+    async def get_form(db: AsyncSession, website_id: uuid.UUID, form_id: uuid.UUID) -> Optional[FormEntry]:
+        key = (website_id, form_id)
+        entry = _forms.get(key)
+        if entry is not None:
+            return entry
+
+        stmt = select(Form).options(selectinload(Form.fields)).where(
+            Form.id == form_id,
+            Form.website_id == website_id
+        )
+        form = (await db.execute(stmt)).scalar_one_or_none()
+        if not form:
+            return None
+
+        entry = FormEntry(FormResponse.model_validate(form))
+        _forms.set(key, entry)
+        return entry
+
+    @staticmethod
+    async def invalidate_website(tracking_id: Optional[str]):
+        if tracking_id:
+            await broadcaster.publish(_WEBSITE_TOPIC, {"tracking_id": tracking_id})
+
+    @staticmethod
+    async def invalidate_form(website_id: uuid.UUID, form_id: uuid.UUID):
+        await broadcaster.publish(_FORM_TOPIC, {"website_id": str(website_id), "form_id": str(form_id)})
+
+    @staticmethod
+    def clear():
+        _websites.clear()
+        _forms.clear()
+
+def _on_website_changed(payload: dict):
+    _websites.pop(payload["tracking_id"])
+
+def _on_form_changed(payload: dict):
+    _forms.pop((uuid.UUID(payload["website_id"]), uuid.UUID(payload["form_id"])))
+
+broadcaster.subscribe(_WEBSITE_TOPIC, _on_website_changed)
+broadcaster.subscribe(_FORM_TOPIC, _on_form_changed)
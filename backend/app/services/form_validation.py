@@ -0,0 +1,185 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from app.models.form_field import FieldType
+from app.schemas.form import FormResponse, FormFieldResponse
+
+MAX_TEXT_LENGTH = 10000
+
+# Fallback keys for contact fields that have no dedicated FieldType
+NAME_KEYS = ("name", "full_name", "fullname")
+PHONE_KEYS = ("phone", "phone_number", "tel", "mobile")
+
+_email_adapter = TypeAdapter(EmailStr)
+_TRUE_VALUES = {"true", "on", "yes", "1"}
+_FALSE_VALUES = {"false", "off", "no", "0", ""}
+
+class FieldError(ValueError):
+    pass
+
+@dataclass
+class ValidatedSubmission:
+    data: Dict[str, Any]
+    email: Optional[str] = None
+    name: Optional[str] = None
+    phone: Optional[str] = None
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+def _text(value: Any) -> str:
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise FieldError("Must be a string")
+    value = str(value).strip()
+    if len(value) > MAX_TEXT_LENGTH:
+        raise FieldError(f"Must be at most {MAX_TEXT_LENGTH} characters")
+    return value
+
+def _email(value: Any) -> str:
+    try:
+        return _email_adapter.validate_python(_text(value)).lower()
+    except ValidationError:
+        raise FieldError("Must be a valid email address")
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool):
+        raise FieldError("Must be a number")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        number = value
+    else:
+        try:
+            number = float(str(value).strip())
+        except ValueError:
+            raise FieldError("Must be a number")
+    # NaN / Infinity (or overflow like "1e400") cannot be stored in JSONB
+    if not math.isfinite(number):
+        raise FieldError("Must be a number")
+    return int(number) if number.is_integer() else number
+
+def _select(options: frozenset) -> Callable[[Any], Any]:
+    def convert(value: Any) -> str:
+        value = _text(value)
+        if value not in options:
+            raise FieldError("Must be one of the allowed options")
+        return value
+    return convert
+
+def _checkbox(options: Optional[frozenset]) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        # With options, a checkbox group submits the list of ticked options
+        if options:
+            values = value if isinstance(value, list) else [value]
+            values = [_text(v) for v in values]
+            if any(v not in options for v in values):
+                raise FieldError("Must only contain allowed options")
+            return values
+        if isinstance(value, bool):
+            return value
+        normalized = str(value).strip().lower()
+        if normalized in _TRUE_VALUES:
+            return True
+        if normalized in _FALSE_VALUES:
+            return False
+        raise FieldError("Must be a boolean")
+    return convert
+
+def _converter(field: FormFieldResponse) -> Callable[[Any], Any]:
+    options = frozenset(field.options) if field.options else None
+    if field.field_type == FieldType.EMAIL:
+        return _email
+    if field.field_type == FieldType.NUMBER:
+        return _number
+    if field.field_type == FieldType.SELECT and options:
+        return _select(options)
+    if field.field_type == FieldType.CHECKBOX:
+        return _checkbox(options)
+    return _text
+
+def _find_key(fields: List[FormFieldResponse], mapped: Optional[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    keys = {f.key for f in fields}
+    if mapped in keys:
+        return mapped
+    by_lower = {f.key.lower(): f.key for f in fields}
+    for candidate in candidates:
+        if candidate in by_lower:
+            return by_lower[candidate]
+    return None
+
+class CompiledFormValidator:
+    """
+    Validator/normalizer compiled once from a form's FormField definitions.
+
+    - Unknown keys are dropped; declared fields are type-checked and coerced.
+    - Contact fields are picked by declared type: the first `email` field is the
+      contact email. Name/phone use `settings.contact_fields` when present,
+      otherwise well-known keys.
+    - Forms without fields accept the payload as-is (legacy behaviour).
+    """
+
+    def __init__(self, form: FormResponse):
+        self.fields = [
+            (f.key, f.required, f.field_type == FieldType.CHECKBOX and not f.options, _converter(f))
+            for f in form.fields
+        ]
+        mapping = form.settings.get("contact_fields") if isinstance(form.settings, dict) else None
+        # Malformed mappings (not a {field: key} object) are ignored
+        if not isinstance(mapping, dict):
+            mapping = {}
+        mapping = {k: v for k, v in mapping.items() if isinstance(v, str)}
+        email_fields = [f.key for f in form.fields if f.field_type == FieldType.EMAIL]
+        self.email_key = mapping.get("email") if mapping.get("email") in email_fields else (email_fields[0] if email_fields else None)
+        self.name_key = _find_key(form.fields, mapping.get("name"), NAME_KEYS)
+        self.phone_key = _find_key(form.fields, mapping.get("phone"), PHONE_KEYS)
+
+    def validate(self, data: Dict[str, Any]) -> ValidatedSubmission:
+        """
+        Returns the normalized submission or raises 422 with per-field errors.
+        """
+        if not self.fields:
+            return self._legacy(data)
+
+        cleaned: Dict[str, Any] = {}
+        errors = []
+        for key, required, is_flag, convert in self.fields:
+            value = data.get(key)
+            if _is_empty(value):
+                if required:
+                    errors.append({"field": key, "msg": "Field required"})
+                continue
+            try:
+                cleaned[key] = convert(value)
+            except FieldError as e:
+                errors.append({"field": key, "msg": str(e)})
+                continue
+            if required and is_flag and cleaned[key] is False:
+                errors.append({"field": key, "msg": "Must be checked"})
+
+        if errors:
+            raise HTTPException(status_code=422, detail=errors)
+
+        email = cleaned.get(self.email_key) if self.email_key else None
+        name = cleaned.get(self.name_key) if self.name_key else None
+        phone = cleaned.get(self.phone_key) if self.phone_key else None
+        if email and not name:
+            name = email.split("@")[0]
+
+        return ValidatedSubmission(
+            data=cleaned,
+            email=email,
+            name=str(name) if name is not None else None,
+            phone=str(phone) if phone is not None else None,
+        )
+
+    @staticmethod
+    def _legacy(data: Dict[str, Any]) -> ValidatedSubmission:
+        email = data.get("email") or data.get("Email")
+        if not email:
+            return ValidatedSubmission(data=data)
+        email = str(email).lower().strip()
+        name = data.get("name") or data.get("Name") or email.split("@")[0]
+        phone = data.get("phone") or data.get("Phone")
+        return ValidatedSubmission(data=data, email=email, name=name, phone=phone)
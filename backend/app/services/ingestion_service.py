@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.submission_service import PendingSubmission, SubmissionService
+
+logger = logging.getLogger("api")
+
+_Entry = Tuple[PendingSubmission, asyncio.Future]
+
+class SubmissionBatcher:
+    """
+    Async ingestion stage for public form submissions.
+
+    Requests enqueue a validated PendingSubmission and await its future.
+    A single background worker drains the queue, groups up to `batch_size`
+    submissions (or whatever arrived within `flush_interval`) and writes
+    them through SubmissionService.write_batch with one commit.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Flushes everything still queued, then stops the worker.
+        """
+        if self._worker is None:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+        self._queue = None
+
+    async def submit(self, item: PendingSubmission) -> PendingSubmission:
+        """
+        Enqueues a submission and waits until its batch is committed.
+        """
+        if self._worker is None:
+            # Not started (e.g. scripts): write synchronously
+            await self._write([item])
+            return item
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Submission queue is full. Please retry shortly."
+            )
+        await future
+        return item
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+
+            batch: List[_Entry] = [entry]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self._flush(batch)
+
+        # Drain anything that raced with shutdown
+        leftovers: List[_Entry] = []
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not None:
+                leftovers.append(entry)
+        if leftovers:
+            await self._flush(leftovers)
+
+    async def _flush(self, batch: List[_Entry]):
+        try:
+            await self._write([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Submission write failed: {e}")
+                self._resolve(batch, e)
+                return
+            # Isolate the bad payload: retry each submission in its own transaction
+            logger.warning(f"Batch write of {len(batch)} submissions failed, retrying individually: {e}")
+            for entry in batch:
+                await self._flush([entry])
+            return
+        self._resolve(batch, None)
+
+    @staticmethod
+    async def _write(items: List[PendingSubmission]):
+        async with AsyncSessionLocal() as db:
+            await SubmissionService.write_batch(db, items)
+
+    @staticmethod
+    def _resolve(batch: List[_Entry], error: Optional[Exception]):
+        for _, future in batch:
+            if future.done():
+                # Caller went away (client disconnect); the write still happened.
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+# Global Instance
+submission_batcher = SubmissionBatcher(
+    batch_size=settings.INGEST_BATCH_SIZE,
+    flush_interval=settings.INGEST_FLUSH_INTERVAL_MS / 1000,
+    max_queue=settings.INGEST_QUEUE_SIZE,
+)
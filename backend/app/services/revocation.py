@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.bloom import BloomFilter
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger("api")
+
+_TOPIC = "token.revoked"
+
+# Rows committed late (or stamped by a worker with a lagging clock) still
+# fall inside the next poll
+_REFRESH_OVERLAP = timedelta(seconds=60)
+
+class RevocationList:
+    """
+    Access token revocation without a query per request.
+
+    Revoked `jti`s are stored in RevokedToken. Every worker mirrors the
+    unexpired ones in a bloom filter: a miss (almost every request) proves
+    the token is not revoked, and only hits are confirmed against the table.
+    Confirmed answers are cached, so a false positive costs one query.
+
+    The filter follows the table incrementally: a background task polls for
+    rows revoked since its last pass, revocations are also broadcast to the
+    other workers, and the filter is rebuilt periodically to shed expired
+    entries. Until the first load succeeds every check goes to the table.
+    """
+
+    def __init__(self, refresh_interval: float, rebuild_interval: float, capacity: int, error_rate: float):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._ready = False
+        self._watermark: Optional[datetime] = None
+        self._built_at = 0.0
+        # Confirmed answers for bloom hits, kept apart so a rebuild can drop
+        # only the "not revoked" ones
+        self._revoked = TTLCache(maxsize=10000, ttl=300)
+        self._not_revoked = TTLCache(maxsize=10000, ttl=300)
+        # jtis remembered while a rebuild query runs; re-added to the new filter
+        self._remembered_during_rebuild: Optional[set] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        if self._ready and jti not in self._bloom:
+            return False
+        if jti in self._revoked:
+            return True
+        if jti in self._not_revoked:
+            return False
+
+        metrics.incr("revocation.lookups")
+        stmt = select(RevokedToken.jti).where(RevokedToken.jti == jti)
+        revoked = (await db.execute(stmt)).scalar_one_or_none() is not None
+        (self._revoked if revoked else self._not_revoked).set(jti, True)
+        return revoked
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: datetime, user_id=None, tenant_id=None):
+        """
+        Records the revocation and commits; this and every other worker reject the token immediately.
+        """
+        await db.execute(
+            pg_insert(RevokedToken).values(
+                jti=jti, revoked_at=datetime.utcnow(), expires_at=expires_at,
+                user_id=user_id, tenant_id=tenant_id
+            ).on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        await db.commit()
+        metrics.incr("revocation.revoked")
+        await broadcaster.publish(_TOPIC, {"jti": jti})
+
+    def remember(self, jti: str):
+        if jti not in self._bloom:
+            self._bloom.add(jti)
+        self._revoked.set(jti, True)
+        self._not_revoked.pop(jti)
+        if self._remembered_during_rebuild is not None:
+            self._remembered_during_rebuild.add(jti)
+
+    async def _run(self):
+        while True:
+            try:
+                if not self._ready or time.monotonic() - self._built_at > self.rebuild_interval:
+                    await self._rebuild()
+                else:
+                    await self._refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.incr("revocation.refresh_errors")
+                logger.error(f"Revocation list refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _rebuild(self):
+        started = datetime.utcnow()
+        # Revocations remembered while the query runs may be missing from its
+        # result; they are carried over so the swap never forgets them
+        self._remembered_during_rebuild = set()
+        try:
+            async with AsyncSessionLocal() as db:
+                stmt = select(RevokedToken.jti).where(RevokedToken.expires_at > started)
+                jtis = set((await db.execute(stmt)).scalars().all())
+            jtis |= self._remembered_during_rebuild
+        finally:
+            self._remembered_during_rebuild = None
+
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        # Rows committed by other workers meanwhile are picked up by the next
+        # poll (the watermark is the query start, not its end)
+        self._bloom = bloom
+        # Cached "not revoked" answers may predate a revocation whose broadcast
+        # this worker missed; the new filter is authoritative for those
+        self._not_revoked.clear()
+        self._watermark = started
+        self._built_at = time.monotonic()
+        self._ready = True
+        metrics.gauge("revocation.entries", len(bloom))
+
+    async def _refresh(self):
+        started = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            stmt = select(RevokedToken.jti).where(RevokedToken.revoked_at > self._watermark - _REFRESH_OVERLAP)
+            jtis = (await db.execute(stmt)).scalars().all()
+        # remember() even when the filter already matched: a bloom false
+        # positive may have cached "not revoked" for this jti
+        for jti in jtis:
+            self.remember(jti)
+        self._watermark = started
+        metrics.gauge("revocation.entries", len(self._bloom))
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession) -> int:
+        """
+        Deletes revocations of tokens that have expired anyway and commits.
+        """
+        result = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+        await db.commit()
+        return result.rowcount
+
+# Global Instance
+revocation_list = RevocationList(
+    refresh_interval=settings.REVOCATION_REFRESH_SECONDS,
+    rebuild_interval=settings.REVOCATION_REBUILD_MINUTES * 60,
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
+
+broadcaster.subscribe(_TOPIC, lambda payload: revocation_list.remember(payload["jti"]))
@@ -0,0 +1,298 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Date, DateTime, Integer, Numeric, String, cast, delete, func, insert, literal_column, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.models.contact import Contact
+from app.models.deal import CLOSED_STAGES, Deal, DealStage
+from app.models.rollup import DailyRollup, HourlyRollup, RollupMetric
+from app.models.submission import FormSubmission
+from app.models.tenant import Tenant
+from app.schemas.dashboard import TrendInterval, TrendPoint
+
+CLOSED_METRICS = {DealStage.WON: RollupMetric.DEALS_WON, DealStage.LOST: RollupMetric.DEALS_LOST}
+
+# A deal's contribution to the rollups: (stage, value, created_at, closed_at)
+DealRollupState = Tuple[DealStage, Optional[Decimal], Optional[datetime], Optional[datetime]]
+
+@dataclass
+class Increment:
+    metric: RollupMetric
+    at: Optional[datetime]
+    count: int = 0
+    value: Decimal = Decimal(0)
+    dimension: str = ""
+
+def _lock_key(tenant_id):
+    return func.hashtext(f"rollup:{tenant_id}")
+
+def _truncate(value: datetime, interval: TrendInterval) -> datetime:
+    if interval == TrendInterval.HOUR:
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == TrendInterval.WEEK:
+        # ISO weeks start on Monday, like date_trunc('week', ...)
+        return day - timedelta(days=day.weekday())
+    if interval == TrendInterval.MONTH:
+        return day.replace(day=1)
+    return day
+
+def _step(value: datetime, interval: TrendInterval) -> datetime:
+    if interval == TrendInterval.HOUR:
+        return value + timedelta(hours=1)
+    if interval == TrendInterval.WEEK:
+        return value + timedelta(weeks=1)
+    if interval == TrendInterval.MONTH:
+        return value.replace(year=value.year + value.month // 12, month=value.month % 12 + 1)
+    return value + timedelta(days=1)
+
+class RollupService:
+    """
+    Maintains the DailyRollup / HourlyRollup trend series.
+
+    Like StatsService, write paths call `record` *before* their own commit,
+    so a bucket changes in the same transaction as the rows it counts.
+    Every contribution is a pure function of the current row (a contact
+    counts on its created_at day, a deal on its created_at / closed_at),
+    so incremental maintenance and `backfill` produce identical rows and a
+    delete removes a row's contribution from the day it was recorded.
+    """
+
+    @staticmethod
+    def contact_increments(created_at: Optional[datetime], sign: int = 1) -> List[Increment]:
+        return [Increment(RollupMetric.CONTACTS_CREATED, created_at, count=sign)]
+
+    @staticmethod
+    def deal_increments(state: Optional[DealRollupState], sign: int = 1) -> List[Increment]:
+        if state is None:
+            return []
+        stage, value, created_at, closed_at = state
+        value = Decimal(str(value or 0)) * sign
+        increments = [Increment(RollupMetric.PIPELINE, created_at, sign, value)]
+        if closed_at is not None:
+            increments.append(Increment(RollupMetric.PIPELINE, closed_at, -sign, -value))
+            increments.append(Increment(CLOSED_METRICS[DealStage(stage)], closed_at, sign, value))
+        return increments
+
+    @staticmethod
+    def deal_delta(before: Optional[DealRollupState], after: Optional[DealRollupState]) -> List[Increment]:
+        return RollupService.deal_increments(before, -1) + RollupService.deal_increments(after, 1)
+
+    @staticmethod
+    async def record(db: AsyncSession, tenant_id, increments: List[Increment]):
+        """
+        Adds `increments` to the daily and (within retention) hourly buckets. Does not commit.
+        """
+        horizon = datetime.utcnow() - timedelta(days=settings.ROLLUP_HOURLY_RETENTION_DAYS)
+        daily: Dict[tuple, list] = {}
+        hourly: Dict[tuple, list] = {}
+        for increment in increments:
+            if increment.at is None:
+                continue
+            targets = [(daily, increment.at.date())]
+            if increment.at >= horizon:
+                targets.append((hourly, _truncate(increment.at, TrendInterval.HOUR)))
+            for rows, bucket in targets:
+                row = rows.setdefault((increment.metric.value, bucket, increment.dimension), [0, Decimal(0)])
+                row[0] += increment.count
+                row[1] += increment.value
+
+        batches = []
+        for model, rows in ((DailyRollup, daily), (HourlyRollup, hourly)):
+            # Fixed order: concurrent writers lock bucket rows the same way (no deadlocks)
+            values = [
+                {"tenant_id": tenant_id, "metric": metric, "bucket": bucket, "dimension": dimension,
+                 "count": count, "value": value}
+                for (metric, bucket, dimension), (count, value) in sorted(rows.items())
+                if count or value
+            ]
+            if values:
+                batches.append((model, values))
+        if not batches:
+            return
+
+        # Shared lock: only `backfill` (exclusive) has to wait for in-flight writes
+        await db.execute(select(func.pg_advisory_xact_lock_shared(_lock_key(tenant_id))))
+        for model, values in batches:
+            stmt = pg_insert(model).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.tenant_id, model.metric, model.bucket, model.dimension],
+                set_={"count": model.count + stmt.excluded.count, "value": model.value + stmt.excluded.value}
+            )
+            await db.execute(stmt)
+
+    @staticmethod
+    async def series(
+        db: AsyncSession,
+        tenant_id,
+        metric: RollupMetric,
+        interval: TrendInterval,
+        start: datetime,
+        end: datetime,
+        dimension: Optional[str] = None,
+        cumulative: bool = False
+    ) -> Dict[str, List[TrendPoint]]:
+        """
+        One zero-filled series per dimension, buckets from `start` to `end`
+        (inclusive). Reads only rollup rows: at most one per day (or hour) and dimension.
+
+        `cumulative` turns net changes into running totals, opening with the
+        sum of everything before `start`.
+        """
+        model = HourlyRollup if interval == TrendInterval.HOUR else DailyRollup
+        first, last = _truncate(start, interval), _truncate(end, interval)
+        lower, upper = first, _step(last, interval)
+        if model is DailyRollup:
+            lower, upper = lower.date(), upper.date()
+
+        conditions = [model.tenant_id == tenant_id, model.metric == metric.value]
+        if dimension is not None:
+            conditions.append(model.dimension == dimension)
+
+        # Interval is inlined, not bound: the SELECT and GROUP BY expressions must match
+        bucket = func.date_trunc(
+            literal_column(f"'{interval.value}'"), cast(model.bucket, DateTime), type_=DateTime
+        ).label("bucket")
+        stmt = select(
+            bucket, model.dimension, func.sum(model.count), func.sum(model.value)
+        ).where(*conditions, model.bucket >= lower, model.bucket < upper).group_by(bucket, model.dimension)
+        totals = {(row[0], row[1]): (row[2], row[3]) for row in (await db.execute(stmt)).all()}
+
+        opening: Dict[str, list] = {}
+        if cumulative:
+            # Hourly rows only cover the retention window: open from the daily
+            # rows before `first`'s day, plus the hours of that day before `first`
+            day = _truncate(first, TrendInterval.DAY)
+            ranges = [(DailyRollup, DailyRollup.bucket < day.date())]
+            if model is HourlyRollup and day < first:
+                ranges.append((HourlyRollup, HourlyRollup.bucket.between(day, first - timedelta(hours=1))))
+            for source, bound in ranges:
+                stmt = select(
+                    source.dimension, func.sum(source.count), func.sum(source.value)
+                ).where(
+                    source.tenant_id == tenant_id, source.metric == metric.value, bound,
+                    *([source.dimension == dimension] if dimension is not None else [])
+                ).group_by(source.dimension)
+                for dim, count, value in (await db.execute(stmt)).all():
+                    row = opening.setdefault(dim, [0, Decimal(0)])
+                    row[0] += count or 0
+                    row[1] += value or 0
+
+        dimensions = {dim for dim, _ in totals} | set(opening)
+        if dimension is not None:
+            dimensions.add(dimension)
+
+        result: Dict[str, List[TrendPoint]] = {}
+        for dim in sorted(dimensions):
+            count, value = opening.get(dim, (0, Decimal(0)))
+            points = []
+            current = first
+            while current <= last:
+                bucket_count, bucket_value = totals.get((current, dim), (0, 0))
+                if cumulative:
+                    count += bucket_count or 0
+                    value += bucket_value or 0
+                    bucket_count, bucket_value = count, value
+                points.append(TrendPoint(bucket=current, count=bucket_count or 0, value=float(bucket_value or 0)))
+                current = _step(current, interval)
+            result[dim] = points
+        return result
+
+    @staticmethod
+    def _source_rows(tenant_id):
+        """
+        Every contribution recomputed from the source tables, mirroring
+        `contact_increments` / `deal_increments` and the submission writer.
+        """
+        # Constants are inlined so the UNION branches have concrete types
+        def metric(value: RollupMetric):
+            return literal_column(f"'{value.value}'", String)
+
+        no_dimension = literal_column("''", String)
+        one, minus_one, zero = (literal_column(text, Integer) for text in ("1", "-1", "0"))
+        value = func.coalesce(Deal.value, 0)
+        parts = [
+            select(
+                Contact.tenant_id.label("tenant_id"), metric(RollupMetric.CONTACTS_CREATED).label("metric"),
+                no_dimension.label("dimension"), Contact.created_at.label("at"),
+                one.label("count"), cast(zero, Numeric).label("value")
+            ).where(Contact.tenant_id == tenant_id, Contact.created_at.is_not(None)),
+            select(
+                FormSubmission.tenant_id, metric(RollupMetric.SUBMISSIONS), cast(FormSubmission.form_id, String),
+                FormSubmission.created_at, one, cast(zero, Numeric)
+            ).where(FormSubmission.tenant_id == tenant_id, FormSubmission.created_at.is_not(None)),
+            select(
+                Deal.tenant_id, metric(RollupMetric.PIPELINE), no_dimension, Deal.created_at, one, value
+            ).where(Deal.tenant_id == tenant_id, Deal.created_at.is_not(None)),
+            select(
+                Deal.tenant_id, metric(RollupMetric.PIPELINE), no_dimension, Deal.closed_at, minus_one, -value
+            ).where(Deal.tenant_id == tenant_id, Deal.closed_at.is_not(None)),
+            # Enum columns store member names: 'WON' -> 'deals_won'
+            select(
+                Deal.tenant_id, literal_column("'deals_'", String) + func.lower(cast(Deal.stage, String)),
+                no_dimension, Deal.closed_at, one, value
+            ).where(Deal.tenant_id == tenant_id, Deal.stage.in_(CLOSED_STAGES), Deal.closed_at.is_not(None)),
+        ]
+        return union_all(*parts).subquery("source")
+
+    @staticmethod
+    async def backfill(db: AsyncSession, tenant_id):
+        """
+        Rebuilds one tenant's rollups from the source tables and commits.
+
+        Holds the tenant's rollup lock exclusively, so in-flight writes commit
+        before the rebuild reads and later writes apply on top of it.
+        """
+        await db.execute(select(func.pg_advisory_xact_lock(_lock_key(tenant_id))))
+        await db.execute(delete(DailyRollup).where(DailyRollup.tenant_id == tenant_id))
+        await db.execute(delete(HourlyRollup).where(HourlyRollup.tenant_id == tenant_id))
+
+        source = RollupService._source_rows(tenant_id)
+        horizon = _truncate(
+            datetime.utcnow() - timedelta(days=settings.ROLLUP_HOURLY_RETENTION_DAYS), TrendInterval.HOUR
+        )
+        for model, unit, where in (
+            (DailyRollup, "day", None),
+            (HourlyRollup, "hour", source.c.at >= horizon),
+        ):
+            bucket = func.date_trunc(literal_column(f"'{unit}'"), source.c.at)
+            if model is DailyRollup:
+                bucket = cast(bucket, Date)
+            stmt = select(
+                source.c.tenant_id, source.c.metric, bucket, source.c.dimension,
+                func.sum(source.c.count), func.sum(source.c.value)
+            ).group_by(source.c.tenant_id, source.c.metric, bucket, source.c.dimension)
+            if where is not None:
+                stmt = stmt.where(where)
+            await db.execute(
+                insert(model).from_select(
+                    ["tenant_id", "metric", "bucket", "dimension", "count", "value"], stmt
+                )
+            )
+        await db.commit()
+
+    @staticmethod
+    async def backfill_all(db: AsyncSession) -> int:
+        """
+        Backfills every tenant, one transaction each. Returns the tenant count.
+        """
+        tenant_ids = (await db.execute(select(Tenant.id))).scalars().all()
+        for tenant_id in tenant_ids:
+            await RollupService.backfill(db, tenant_id)
+        return len(tenant_ids)
+
+    @staticmethod
+    async def prune_hourly(db: AsyncSession) -> int:
+        """
+        Drops hourly buckets past retention and commits. Returns the number of rows removed.
+        """
+        horizon = _truncate(
+            datetime.utcnow() - timedelta(days=settings.ROLLUP_HOURLY_RETENTION_DAYS), TrendInterval.HOUR
+        )
+        result = await db.execute(delete(HourlyRollup).where(HourlyRollup.bucket < horizon))
+        await db.commit()
+        return result.rowcount
@@ -0,0 +1,128 @@
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.models.contact import Contact
+from app.models.deal import Deal, DealStage
+from app.models.tenant import Tenant
+from app.models.tenant_stats import TenantStats
+
+logger = logging.getLogger("api")
+
+# stage -> (count column, value column)
+STAGE_COLUMNS = {stage: (f"{stage.value}_count", f"{stage.value}_value") for stage in DealStage}
+
+COUNTER_COLUMNS = ["contact_count"] + [column for pair in STAGE_COLUMNS.values() for column in pair]
+
+# A deal's contribution to the counters: (stage, value)
+DealState = Tuple[DealStage, Optional[Decimal]]
+
+class StatsService:
+    """
+    Maintains TenantStats incrementally.
+
+    Write paths call `apply` with deltas *before* their own commit, so the
+    counters change in the same transaction as the rows they describe. The
+    upsert takes a row lock on the tenant's stats until commit; `reconcile`
+    recomputes from the source tables to correct any drift.
+    """
+
+    @staticmethod
+    def deal_delta(before: Optional[DealState], after: Optional[DealState]) -> Dict[str, Decimal]:
+        """
+        Counter deltas for a deal going from `before` to `after` (None = not present).
+        """
+        deltas: Dict[str, Decimal] = {}
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            stage, value = state
+            count_col, value_col = STAGE_COLUMNS[DealStage(stage)]
+            deltas[count_col] = deltas.get(count_col, 0) + sign
+            deltas[value_col] = deltas.get(value_col, 0) + sign * Decimal(str(value or 0))
+        return deltas
+
+    @staticmethod
+    async def apply(db: AsyncSession, tenant_id, deltas: Dict[str, Decimal]):
+        """
+        Adds `deltas` (column -> amount) to the tenant's counters. Does not commit.
+        """
+        deltas = {column: amount for column, amount in deltas.items() if amount}
+        if not deltas:
+            return
+        now = datetime.utcnow()
+        stmt = pg_insert(TenantStats).values(tenant_id=tenant_id, updated_at=now, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TenantStats.tenant_id],
+            set_={
+                **{column: getattr(TenantStats, column) + stmt.excluded[column] for column in deltas},
+                "updated_at": now,
+            }
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def get(db: AsyncSession, tenant_id) -> TenantStats:
+        stats = await db.get(TenantStats, tenant_id)
+        if stats is None:
+            stats = await StatsService.reconcile(db, tenant_id)
+        return stats
+
+    @staticmethod
+    async def reconcile(db: AsyncSession, tenant_id) -> TenantStats:
+        """
+        Recomputes one tenant's counters from `contact` and `deal` and commits.
+
+        The stats row is locked first: concurrent writers block on their own
+        upsert until we commit, and the recount (a fresh snapshot taken after
+        the lock) already includes every write that committed before it.
+        """
+        await db.execute(
+            pg_insert(TenantStats).values(tenant_id=tenant_id).on_conflict_do_nothing(
+                index_elements=[TenantStats.tenant_id]
+            )
+        )
+        stats = (await db.execute(
+            select(TenantStats).where(TenantStats.tenant_id == tenant_id).with_for_update()
+        )).scalar_one()
+
+        actual = {column: 0 for column in COUNTER_COLUMNS}
+        actual["contact_count"] = (await db.execute(
+            select(func.count(Contact.id)).where(Contact.tenant_id == tenant_id)
+        )).scalar() or 0
+        stmt = select(Deal.stage, func.count(Deal.id), func.coalesce(func.sum(Deal.value), 0)).where(
+            Deal.tenant_id == tenant_id
+        ).group_by(Deal.stage)
+        for stage, count, value in (await db.execute(stmt)).all():
+            count_col, value_col = STAGE_COLUMNS[stage]
+            actual[count_col], actual[value_col] = count, value
+
+        drift = {
+            column: actual[column] - (getattr(stats, column) or 0)
+            for column in COUNTER_COLUMNS
+            if actual[column] != getattr(stats, column)
+        }
+        if drift:
+            logger.warning(f"Tenant stats drift corrected for {tenant_id}: {drift}")
+
+        now = datetime.utcnow()
+        for column, value in actual.items():
+            setattr(stats, column, value)
+        stats.updated_at = now
+        stats.reconciled_at = now
+        await db.commit()
+        return stats
+
+    @staticmethod
+    async def reconcile_all(db: AsyncSession) -> int:
+        """
+        Reconciles every tenant, one short transaction each. Returns the tenant count.
+        """
+        tenant_ids = (await db.execute(select(Tenant.id))).scalars().all()
+        for tenant_id in tenant_ids:
+            await StatsService.reconcile(db, tenant_id)
+        return len(tenant_ids)
@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.events import dispatcher
+from app.models.contact import Contact, ContactStatus
+from app.models.submission import FormSubmission
+from app.models.activity import Activity, ActivityType
+from app.models.rollup import RollupMetric
+from app.services.rollup_service import Increment, RollupService
+from app.services.stats_service import StatsService
+import uuid
+
+@dataclass
+class PendingSubmission:
+    """
+    A validated public form submission, ready to be written.
+    Carries everything the writer needs so no further lookups are required.
+    """
+    tenant_id: uuid.UUID
+    website_id: uuid.UUID
+    form_id: uuid.UUID
+    form_name: str
+    domain: str
+    data: Dict[str, Any]
+    meta: Dict[str, Any]
+    email: Optional[str] = None
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+class SubmissionService:
+    @staticmethod
+    async def write_batch(db: AsyncSession, items: List[PendingSubmission]) -> None:
+        """
+        Writes many submissions in a single transaction:
+        1. One multi-row Contact upsert (ON CONFLICT uq_contact_tenant_email)
+        2. One multi-row FormSubmission insert
+        3. One multi-row Activity insert
+        4. Trend rollup upserts
+        """
+        if not items:
+            return
+
+        now = datetime.utcnow()
+
+        # 1. Contact Upsert
+        # Postgres rejects an upsert that touches the same row twice,
+        # so collapse duplicates (same tenant + email) within the batch first.
+        contact_rows: Dict[Tuple[uuid.UUID, str], Dict[str, Any]] = {}
+        for item in items:
+            if not item.email:
+                continue
+            key = (item.tenant_id, item.email)
+            if key not in contact_rows:
+                contact_rows[key] = {
+                    "id": uuid.uuid4(),
+                    "tenant_id": item.tenant_id,
+                    "website_id": item.website_id,
+                    "email": item.email,
+                    "name": item.name,
+                    "phone": item.phone,
+                    "source": f"Form: {item.form_name} ({item.domain})",
+                    "status": ContactStatus.NEW,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+
+        contact_ids: Dict[Tuple[uuid.UUID, str], uuid.UUID] = {}
+        new_contacts: Dict[uuid.UUID, int] = {}
+        if contact_rows:
+            # Fixed order: concurrent batches sharing contacts take the row
+            # locks the same way (no deadlocks)
+            rows = [contact_rows[key] for key in sorted(contact_rows, key=lambda k: (str(k[0]), k[1]))]
+            insert_stmt = pg_insert(Contact).values(rows)
+            # Passive Update: existing contacts only get 'updated_at' bumped
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                constraint='uq_contact_tenant_email',
+                set_={"updated_at": insert_stmt.excluded.updated_at}
+            ).returning(
+                Contact.id, Contact.tenant_id, Contact.email,
+                # xmax is 0 only for freshly inserted rows (not conflict updates)
+                literal_column("xmax = 0").label("inserted")
+            )
+
+            result = await db.execute(upsert_stmt)
+            for row in result:
+                contact_ids[(row.tenant_id, row.email)] = row.id
+                if row.inserted:
+                    new_contacts[row.tenant_id] = new_contacts.get(row.tenant_id, 0) + 1
+
+            # Fixed order: concurrent batches lock stats rows the same way (no deadlocks)
+            for tenant_id in sorted(new_contacts, key=str):
+                await StatsService.apply(db, tenant_id, {"contact_count": new_contacts[tenant_id]})
+
+        # 2. Save Submissions (Raw Data)
+        await db.execute(
+            insert(FormSubmission).values([
+                {
+                    "id": item.id,
+                    "form_id": item.form_id,
+                    "website_id": item.website_id,
+                    "tenant_id": item.tenant_id,
+                    "data": item.data,
+                    "meta": item.meta,
+                    "created_at": item.created_at,
+                }
+                for item in items
+            ])
+        )
+
+        # 3. Log Activities (For submissions that resolved to a contact)
+        activity_rows = [
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": item.tenant_id,
+                "contact_id": contact_ids[(item.tenant_id, item.email)],
+                "type": ActivityType.FORM,
+                "content": f"Submitted form '{item.form_name}' on {item.domain}",
+                "created_at": item.created_at,
+                "updated_at": item.created_at,
+            }
+            for item in items
+            if item.email and (item.tenant_id, item.email) in contact_ids
+        ]
+        if activity_rows:
+            await db.execute(insert(Activity).values(activity_rows))
+
+        # 4. Trend Rollups (new contacts + submissions per form)
+        increments: Dict[uuid.UUID, List[Increment]] = {}
+        for tenant_id, count in new_contacts.items():
+            increments.setdefault(tenant_id, []).append(Increment(RollupMetric.CONTACTS_CREATED, now, count=count))
+        for item in items:
+            increments.setdefault(item.tenant_id, []).append(
+                Increment(RollupMetric.SUBMISSIONS, item.created_at, count=1, dimension=str(item.form_id))
+            )
+        for tenant_id in sorted(increments, key=str):
+            await RollupService.record(db, tenant_id, increments[tenant_id])
+
+        await db.commit()
+
+        for item in items:
+            contact_id = contact_ids.get((item.tenant_id, item.email)) if item.email else None
+            await dispatcher.dispatch("submission.created", {
+                "tenant_id": str(item.tenant_id),
+                "form_id": str(item.form_id),
+                "contact_id": str(contact_id) if contact_id else None,
+                "id": str(item.id),
+            })
@@ -0,0 +1,56 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.tenant import Tenant
+from app.schemas.auth import TenantRead
+
+# Marker for slugs known not to exist (negative caching)
+_UNKNOWN = object()
+
+# Keyed by slug
+_tenants = TTLCache(maxsize=settings.TENANT_CACHE_MAX_ENTRIES, ttl=settings.TENANT_CACHE_TTL_SECONDS)
+
+_TOPIC = "tenant.changed"
+
+class TenantDirectory:
+    """
+    Slug -> Tenant resolution for unauthenticated entry points (login, public leads).
+    Unknown slugs are cached briefly as well, so enumeration floods do not reach Postgres.
+    """
+
+    @staticmethod
+    async def resolve(db: AsyncSession, slug: str) -> Optional[TenantRead]:
+        cached = _tenants.get(slug)
+        if cached is _UNKNOWN:
+            return None
+        if cached is not None:
+            return cached
+
+        stmt = select(Tenant).where(Tenant.slug == slug)
+        tenant = (await db.execute(stmt)).scalar_one_or_none()
+        if not tenant:
+            _tenants.set(slug, _UNKNOWN, ttl=settings.TENANT_CACHE_NEGATIVE_TTL_SECONDS)
+            return None
+
+        entry = TenantRead.model_validate(tenant)
+        _tenants.set(slug, entry)
+        return entry
+
+    @staticmethod
+    async def invalidate(slug: str):
+        """
+        Call after a tenant is registered, renamed or (de)activated (applies on every worker).
+        """
+        await broadcaster.publish(_TOPIC, {"slug": slug})
+
+    @staticmethod
+    def clear():
+        _tenants.clear()
+
+def _on_tenant_changed(payload: dict):
+    _tenants.pop(payload["slug"])
+
+broadcaster.subscribe(_TOPIC, _on_tenant_changed)
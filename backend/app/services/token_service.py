@@ -0,0 +1,113 @@
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.refresh_token import RefreshToken
+from app.models.tenant import Tenant
+from app.services.user_directory import UserDirectory
+
+logger = logging.getLogger("api")
+
+def _invalid() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+class TokenService:
+    """
+    Access / refresh token pairs.
+
+    A login starts a token family. POST /auth/refresh exchanges a refresh
+    token for a new pair and marks the old one used, so renewing a session
+    costs one indexed lookup instead of a bcrypt verification. Presenting a
+    used token again means it was copied: the whole family is revoked and
+    whoever holds it has to log in again.
+    """
+
+    @staticmethod
+    async def issue(db: AsyncSession, user_id, tenant_id, family_id: Optional[uuid.UUID] = None) -> dict:
+        """
+        Mints an access token and a refresh token (stored hashed) and commits.
+        """
+        refresh_token = security.create_refresh_token()
+        db.add(RefreshToken(
+            token_hash=security.hash_token(refresh_token),
+            family_id=family_id or uuid.uuid4(),
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            user_id=user_id,
+            tenant_id=tenant_id
+        ))
+        await db.commit()
+        return {
+            "access_token": security.create_access_token(subject=user_id, tenant_id=str(tenant_id)),
+            "token_type": "bearer",
+            "refresh_token": refresh_token,
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        }
+
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str) -> dict:
+        # Row lock: two concurrent exchanges of one token cannot both succeed
+        stmt = select(RefreshToken, Tenant.is_active).join(
+            Tenant, Tenant.id == RefreshToken.tenant_id
+        ).where(
+            RefreshToken.token_hash == security.hash_token(refresh_token)
+        ).with_for_update(of=RefreshToken)
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            raise _invalid()
+        stored, tenant_active = row
+
+        now = datetime.utcnow()
+        if stored.revoked_at is not None or stored.expires_at <= now:
+            raise _invalid()
+        if stored.used_at is not None:
+            metrics.incr("auth.refresh_reuse")
+            logger.warning(f"Refresh token reuse detected, revoking family {stored.family_id} (user {stored.user_id})")
+            await TokenService.revoke_family(db, stored.family_id)
+            raise _invalid()
+
+        user = await UserDirectory.resolve(db, stored.user_id, stored.tenant_id)
+        if not user or not user.is_active or not tenant_active:
+            raise _invalid()
+
+        stored.used_at = now
+        metrics.incr("auth.refreshed")
+        return await TokenService.issue(db, stored.user_id, stored.tenant_id, stored.family_id)
+
+    @staticmethod
+    async def revoke_family(db: AsyncSession, family_id: uuid.UUID):
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        await db.commit()
+
+    @staticmethod
+    async def revoke(db: AsyncSession, refresh_token: str, user_id):
+        """
+        Ends the session a refresh token belongs to (logout). Tokens of other
+        users are ignored rather than reported.
+        """
+        stmt = select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == security.hash_token(refresh_token),
+            RefreshToken.user_id == user_id
+        )
+        family_id = (await db.execute(stmt)).scalar_one_or_none()
+        if family_id is not None:
+            await TokenService.revoke_family(db, family_id)
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession) -> int:
+        """
+        Deletes expired refresh tokens and commits. Returns the number removed.
+        """
+        result = await db.execute(delete(RefreshToken).where(RefreshToken.expires_at < datetime.utcnow()))
+        await db.commit()
+        return result.rowcount
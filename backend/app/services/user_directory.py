@@ -0,0 +1,53 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.broadcast import broadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.auth import UserPrincipal
+
+# Keyed by (user_id, tenant_id)
+_principals = TTLCache(maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+_TOPIC = "user.changed"
+
+class UserDirectory:
+    """
+    (user_id, tenant_id) -> UserPrincipal for every authenticated request.
+    A hit needs no query; changes to role or active status are broadcast
+    to all workers, so they apply immediately instead of after the TTL.
+    """
+
+    @staticmethod
+    async def resolve(db: AsyncSession, user_id: str, tenant_id: str) -> Optional[UserPrincipal]:
+        key = (str(user_id), str(tenant_id))
+        cached = _principals.get(key)
+        if cached is not None:
+            return cached
+
+        # Strict Tenant Scoping: a user ID from another tenant resolves to None
+        stmt = select(User).where(User.id == user_id, User.tenant_id == tenant_id)
+        user = (await db.execute(stmt)).scalar_one_or_none()
+        if not user:
+            return None
+
+        principal = UserPrincipal.model_validate(user)
+        _principals.set(key, principal)
+        return principal
+
+    @staticmethod
+    async def invalidate(user_id: str, tenant_id: str):
+        """
+        Call after a user's role or active status changes (or the user is deleted).
+        """
+        await broadcaster.publish(_TOPIC, {"user_id": str(user_id), "tenant_id": str(tenant_id)})
+
+    @staticmethod
+    def clear():
+        _principals.clear()
+
+def _on_user_changed(payload: dict):
+    _principals.pop((payload["user_id"], payload["tenant_id"]))
+
+broadcaster.subscribe(_TOPIC, _on_user_changed)
@@ -1,4 +1,5 @@
-import axios from 'axios';
+import axios, { type InternalAxiosRequestConfig } from 'axios';
+import type { TokenResponse } from '../types/auth';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000/api/v1';
 
@@ -17,15 +18,51 @@ client.interceptors.request.use((config) => {
     return config;
 });
 
+// One refresh at a time: concurrent 401s wait for the same new token pair
+let refreshing: Promise<string> | null = null;
+
+const refreshAccessToken = async (): Promise<string> => {
+    const refreshToken = localStorage.getItem('crm_refresh_token');
+    if (!refreshToken) {
+        throw new Error('No refresh token');
+    }
+    // Plain axios: a failing refresh must not re-enter this interceptor
+    const response = await axios.post<TokenResponse>(`${API_URL}/auth/refresh`, { refresh_token: refreshToken });
+    localStorage.setItem('crm_token', response.data.access_token);
+    if (response.data.refresh_token) {
+        localStorage.setItem('crm_refresh_token', response.data.refresh_token);
+    }
+    return response.data.access_token;
+};
+
+const endSession = () => {
+    if (localStorage.getItem('crm_token')) {
+        localStorage.removeItem('crm_token');
+        localStorage.removeItem('crm_refresh_token');
+        window.location.href = '/auth';
+    }
+};
+
 client.interceptors.response.use(
     (response) => response,
-    (error) => {
-        if (error.response?.status === 401) {
-            if (localStorage.getItem('crm_token')) {
-                localStorage.removeItem('crm_token');
-                window.location.href = '/auth';
+    async (error) => {
+        const original = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined;
+        if (error.response?.status === 401 && original && !original._retried && !original.url?.startsWith('/auth/')) {
+            // Expired access token: renew it once with the refresh token, then retry
+            original._retried = true;
+            try {
+                refreshing = refreshing ?? refreshAccessToken().finally(() => { refreshing = null; });
+                const token = await refreshing;
+                original.headers.Authorization = `Bearer ${token}`;
+                return client(original);
+            } catch {
+                endSession();
+                return Promise.reject(error);
             }
         }
+        if (error.response?.status === 401) {
+            endSession();
+        }
         return Promise.reject(error);
     }
 );
@@ -1,9 +1,16 @@
 import client from './client';
 import type { Deal, DealCreate, DealUpdate } from '../types/deal';
 
+// The list is cursor-paginated: follow X-Next-Cursor until the last page
 export const getDeals = async (): Promise<Deal[]> => {
-    const response = await client.get<Deal[]>('/deals');
-    return response.data;
+    const deals: Deal[] = [];
+    let cursor: string | undefined;
+    do {
+        const response = await client.get<Deal[]>('/deals', { params: cursor ? { cursor } : undefined });
+        deals.push(...response.data);
+        cursor = response.headers['x-next-cursor'];
+    } while (cursor);
+    return deals;
 };
 
 export const createDeal = async (deal: DealCreate): Promise<Deal> => {
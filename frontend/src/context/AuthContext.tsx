@@ -3,7 +3,7 @@ import { createContext, useContext, useState, type ReactNode } from 'react';
 interface AuthContextType {
     isAuthenticated: boolean;
     token: string | null;
-    login: (token: string) => void;
+    login: (token: string, refreshToken?: string) => void;
     logout: () => void;
 }
 
@@ -12,13 +12,17 @@ const AuthContext = createContext<AuthContextType | undefined>(undefined);
 export const AuthProvider = ({ children }: { children: ReactNode }) => {
     const [token, setToken] = useState<string | null>(localStorage.getItem('crm_token'));
 
-    const login = (newToken: string) => {
+    const login = (newToken: string, refreshToken?: string) => {
         localStorage.setItem('crm_token', newToken);
+        if (refreshToken) {
+            localStorage.setItem('crm_refresh_token', refreshToken);
+        }
         setToken(newToken);
     };
 
     const logout = () => {
         localStorage.removeItem('crm_token');
+        localStorage.removeItem('crm_refresh_token');
         setToken(null);
     };
 
@@ -46,7 +46,7 @@ const AuthPage: React.FC = () => {
 
         try {
             const data = await apiLogin({ tenant_slug: tenantSlug, email, password });
-            login(data.access_token);
+            login(data.access_token, data.refresh_token);
             navigate('/dashboard');
         } catch (err: unknown) {
             let message = 'Login failed. Please check your credentials.';
@@ -15,4 +15,6 @@ export interface RegisterCredentials {
 export interface TokenResponse {
     access_token: string;
     token_type: string;
+    refresh_token?: string;
+    expires_in?: number;
 }